@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/3.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
+import importlib.util
 import os
 from pathlib import Path
 
@@ -47,12 +48,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "app.urls"
@@ -81,14 +84,45 @@ WSGI_APPLICATION = "app.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "core.db.backends.postgresql",
         "HOST": os.environ.get("DB_HOST"),
         "NAME": os.environ.get("DB_NAME"),
         "USER": os.environ.get("POSTGRES_USER"),
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
+        # Seconds to keep a connection open between requests, 0 closes it
+        # after every request.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", "1") == "1",
+        # Per-process connection pool, 0 disables it.
+        "POOL_MAX_SIZE": int(os.environ.get("DB_POOL_MAX_SIZE", 0)),
+        "POOL_TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
     }
 }
 
+# Read replicas, e.g. DB_REPLICA_HOSTS=replica1,replica2. Each mirrors
+# "default" apart from its host (and DB_REPLICA_NAME if set), so the same
+# server can also be listed under a second alias.
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+    filter(None, os.environ.get("DB_REPLICA_HOSTS", "").split(","))
+):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "NAME": os.environ.get("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["core.db.routers.PrimaryReplicaRouter"]
+# Seconds after a write during which that client only reads from "default".
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get("DB_REPLICA_STICKY_SECONDS", 5))
+# CACHES alias holding the stickiness markers. It must be shared between
+# worker processes (Redis, Memcached), otherwise a write handled by one
+# worker does not pin the client's reads in the others (check core.W001).
+DATABASE_REPLICA_STICKY_CACHE = os.environ.get("DB_REPLICA_STICKY_CACHE", "default")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -132,6 +166,18 @@ MEDIA_URL = "/static/media/"
 MEDIA_ROOT = "/vol/web/media"
 STATIC_ROOT = "/vol/web/static"
 
+# Resized copies generated for every recipe image, name -> max (width, height).
+RECIPE_IMAGE_VARIANTS = {
+    "thumbnail": (150, 150),
+    "small": (480, 480),
+    "medium": (1024, 1024),
+}
+RECIPE_IMAGE_WORKERS = int(os.environ.get("RECIPE_IMAGE_WORKERS", 2))
+RECIPE_IMAGE_MAX_UPLOAD_SIZE = int(
+    os.environ.get("RECIPE_IMAGE_MAX_UPLOAD_SIZE", 10 * 2**20)
+)
+RECIPE_IMAGE_MAX_PIXELS = int(os.environ.get("RECIPE_IMAGE_MAX_PIXELS", 40_000_000))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -139,6 +185,73 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "core.User"
 
-REST_FRAMEWORK = {"DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema"}
+REST_FRAMEWORK = {
+    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson-backed when installed, stdlib json otherwise.
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Token buckets per user, or per IP for anonymous requests. Views pick a
+    # scope with `throttle_scope`, otherwise reads and writes are split by
+    # method.
+    "DEFAULT_THROTTLE_CLASSES": ["core.throttling.TokenBucketThrottle"],
+    "DEFAULT_THROTTLE_RATES": {
+        "read": os.environ.get("THROTTLE_READ_RATE", "1200/min"),
+        "write": os.environ.get("THROTTLE_WRITE_RATE", "300/min"),
+        "upload": os.environ.get("THROTTLE_UPLOAD_RATE", "30/min"),
+        "token": os.environ.get("THROTTLE_TOKEN_RATE", "20/min"),
+    },
+}
+
+# MessagePack for internal services, negotiated via Accept/Content-Type
+# "application/msgpack" when the msgpack package is installed.
+if importlib.util.find_spec("msgpack") is not None:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "core.renderers.MessagePackRenderer"
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].append("core.parsers.MessagePackParser")
+
+# Two-tier caches (utils.cache.TieredCache): MAX_SIZE bounds the per-process
+# LRU and BACKEND optionally names a CACHES alias shared between processes.
+
+# Token -> user resolution cache used by user.authentication.
+TOKEN_AUTH_CACHE = {
+    "MAX_SIZE": int(os.environ.get("TOKEN_AUTH_CACHE_MAX_SIZE", 10000)),
+    "TTL": int(os.environ.get("TOKEN_AUTH_CACHE_TTL", 60)),
+    "BACKEND": os.environ.get("TOKEN_AUTH_CACHE_BACKEND"),
+}
+
+# Token bucket storage used by core.throttling.
+THROTTLE_CACHE = {
+    "MAX_SIZE": int(os.environ.get("THROTTLE_CACHE_MAX_SIZE", 100000)),
+    "BACKEND": os.environ.get("THROTTLE_CACHE_BACKEND"),
+}
+
+# Used by core.middleware.CompressionMiddleware.
+RESPONSE_COMPRESSION = {
+    # Smaller bodies are sent as is; streaming responses are always compressed.
+    "MIN_SIZE": int(os.environ.get("RESPONSE_COMPRESSION_MIN_SIZE", 1024)),
+    # Levels per encoding: gzip 1-9, br 0-11, zstd 1-22.
+    "LEVELS": {
+        "gzip": int(os.environ.get("RESPONSE_COMPRESSION_GZIP_LEVEL", 6)),
+        "br": int(os.environ.get("RESPONSE_COMPRESSION_BROTLI_LEVEL", 4)),
+        "zstd": int(os.environ.get("RESPONSE_COMPRESSION_ZSTD_LEVEL", 3)),
+    },
+    # API payloads only: HTML pages carry CSRF tokens, which compression
+    # would expose to BREACH-style attacks.
+    "CONTENT_TYPES": [
+        "application/json",
+        "application/msgpack",
+        "application/vnd.oai.openapi",
+        "application/vnd.oai.openapi+json",
+        "text/plain",
+    ],
+}
 
 SPECTACULAR_SETTINGS = {"COMPONENT_SPLIT_REQUEST": True}
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Warning, register
+
+# Backends whose entries are invisible to other processes.
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+@register()
+def check_replica_sticky_cache(app_configs, **kwargs):
+    """Read-your-writes after a write needs markers every worker can see."""
+    if not settings.DATABASE_REPLICAS:
+        return []
+    alias = settings.DATABASE_REPLICA_STICKY_CACHE
+    if not isinstance(caches[alias], PROCESS_LOCAL_CACHES):
+        return []
+    return [
+        Warning(
+            f"DATABASE_REPLICA_STICKY_CACHE names the process-local cache "
+            f"{alias!r}.",
+            hint=(
+                "With several worker processes, clients may not read their own "
+                "writes. Point it at a shared cache such as Redis or Memcached."
+            ),
+            id="core.W001",
+        )
+    ]
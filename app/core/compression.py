@@ -0,0 +1,115 @@
+"""
+Incremental response compressors for the encodings we can negotiate.
+
+gzip is always available; brotli ("br") and zstd are used when the `brotli`
+and `zstandard` packages are installed.
+"""
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+class GzipCompressor:
+    def __init__(self, level):
+        # wbits 16 + MAX_WBITS writes a gzip header and trailer.
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, level):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._obj.process(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+# Installed encodings, most preferred first.
+COMPRESSORS = {
+    name: compressor
+    for name, compressor, available in (
+        ("br", BrotliCompressor, brotli is not None),
+        ("zstd", ZstdCompressor, zstandard is not None),
+        ("gzip", GzipCompressor, True),
+    )
+    if available
+}
+
+
+def select_encoding(accept_encoding):
+    """
+    Pick the encoding to use for an Accept-Encoding header value, or None.
+
+    The client's q-values rank the encodings first; ties go to the order of
+    `COMPRESSORS`.
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    ranked = [
+        (qualities.get(name, wildcard), -index, name)
+        for index, name in enumerate(COMPRESSORS)
+    ]
+    quality, _, name = max(ranked)
+    return name if quality > 0 else None
+
+
+def compress(encoding, level, data):
+    compressor = COMPRESSORS[encoding](level)
+    return compressor.compress(data) + compressor.finish()
+
+
+def compress_sequence(encoding, level, chunks):
+    """Compress an iterable of chunks, flushing after each one."""
+    compressor = COMPRESSORS[encoding](level)
+    for chunk in chunks:
+        if chunk:
+            yield compressor.compress(chunk) + compressor.flush()
+    yield compressor.finish()
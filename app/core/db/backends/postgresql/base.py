@@ -0,0 +1,106 @@
+"""
+PostgreSQL backend adding connection health checks and a per-process pool.
+
+Extra `DATABASES` keys:
+
+- `CONN_HEALTH_CHECKS`: ping a persistent or pooled connection before its
+  first use in a request and reconnect if it is broken (built in from
+  Django 4.1 on).
+- `POOL_MAX_SIZE`: keep up to this many connections per process in a pool
+  that `close()` returns connections to instead of disconnecting; 0
+  disables pooling.
+- `POOL_TIMEOUT`: seconds to wait for a pooled connection when all
+  `POOL_MAX_SIZE` are checked out.
+"""
+from core.db.backends.postgresql.creation import DatabaseCreation
+from core.db.pool import get_pool
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+Database = base.Database
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_done = False
+
+    @property
+    def health_check_enabled(self):
+        return self.settings_dict.get("CONN_HEALTH_CHECKS", False)
+
+    def get_pool(self, conn_params):
+        max_size = self.settings_dict.get("POOL_MAX_SIZE", 0)
+        if not max_size:
+            return None
+        key = (self.alias, repr(sorted(conn_params.items())))
+        return get_pool(
+            key, max_size=max_size, timeout=self.settings_dict.get("POOL_TIMEOUT", 10)
+        )
+
+    def get_new_connection(self, conn_params):
+        pool = self.get_pool(conn_params)
+        if pool is None:
+            connection = super().get_new_connection(conn_params)
+        else:
+            connection = pool.acquire(
+                lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                check=self._ping if self.health_check_enabled else None,
+            )
+            self.isolation_level = self.settings_dict["OPTIONS"].get(
+                "isolation_level", connection.isolation_level
+            )
+        # A brand-new or just-checked-out connection needs no further check
+        # within this request.
+        self.health_check_done = True
+        return connection
+
+    def _close(self):
+        pool = self.get_pool(self.get_connection_params())
+        if pool is None:
+            return super()._close()
+
+        with self.wrap_database_errors:
+            # Connections closed mid-transaction may still be referenced by
+            # this wrapper, so never hand them to another thread.
+            if self.in_atomic_block or self.errors_occurred:
+                return pool.discard(self.connection)
+            status = self.connection.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                return pool.discard(self.connection)
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                self.connection.rollback()
+            pool.release(self.connection)
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        # Called at request boundaries: recheck on the next use.
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        if (
+            self.connection is None
+            or not self.health_check_enabled
+            or self.health_check_done
+        ):
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
+
+    @staticmethod
+    def _ping(connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if not connection.autocommit:
+                connection.rollback()
+        except Database.Error:
+            return False
+        return True
@@ -0,0 +1,100 @@
+import threading
+import time
+
+import psycopg2
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """No pooled connection became available in time."""
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of idle DB-API connections.
+
+    At most `max_size` connections exist at once, idle or checked out;
+    `acquire` waits up to `timeout` seconds for one to be released.
+    """
+
+    def __init__(self, max_size: int, timeout: float):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = []
+        self._size = 0
+        self._lock = threading.Condition()
+
+    def __len__(self):
+        return self._size
+
+    def acquire(self, connect, check=None):
+        """
+        Return an idle connection that passes `check`, or a new one from
+        `connect` while below `max_size`.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._lock:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._lock.wait(remaining):
+                        raise PoolTimeout(
+                            f"No connection available within {self.timeout}s "
+                            f"(pool size {self.max_size})."
+                        )
+                connection = self._idle.pop() if self._idle else None
+                if connection is None:
+                    self._size += 1
+
+            if connection is None:
+                try:
+                    return connect()
+                except BaseException:
+                    self._release_slot()
+                    raise
+            if check is None or check(connection):
+                return connection
+            self.discard(connection)
+
+    def release(self, connection):
+        if connection.closed:
+            self._release_slot()
+            return
+        with self._lock:
+            self._idle.append(connection)
+            self._lock.notify()
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        finally:
+            self._release_slot()
+
+    def close(self):
+        """Close all idle connections; checked-out ones are left alone."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self.discard(connection)
+
+    def _release_slot(self):
+        with self._lock:
+            self._size -= 1
+            self._lock.notify()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, max_size, timeout):
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(max_size=max_size, timeout=timeout)
+        return _pools[key]
+
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
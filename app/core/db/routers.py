@@ -0,0 +1,32 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+# Set per request by core.middleware.ReplicaRoutingMiddleware. Reads made
+# anywhere else (commands, shells, migrations) stay on the primary.
+replica_reads = ContextVar("replica_reads", default=False)
+
+
+class PrimaryReplicaRouter:
+    """Send reads to a random `DATABASE_REPLICAS` alias when allowed."""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            replicas
+            and replica_reads.get()
+            and not connections["default"].in_atomic_block
+        ):
+            return random.choice(replicas)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,71 @@
+"""
+Django command to compare response compression codecs and levels.
+"""
+import random
+import time
+
+from core import compression
+from django.core.management.base import BaseCommand
+from rest_framework.settings import api_settings
+
+LEVELS = {
+    "gzip": (1, 6, 9),
+    "br": (1, 4, 6, 11),
+    "zstd": (1, 3, 9, 19),
+}
+
+
+class Command(BaseCommand):
+    """
+    Compress a recipe list payload with every installed encoding at several
+    levels and report the size saved against the CPU time spent.
+    """
+
+    help = "Benchmark response compression on recipe list payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipes", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        body = self._payload(options["recipes"], random.Random(options["seed"]))
+        self.stdout.write(f"Payload: {len(body)} bytes, {options['recipes']} recipes")
+        self.stdout.write(
+            f"{'encoding':<8} {'level':>5} {'bytes':>9} {'ratio':>6} "
+            f"{'ms':>8} {'MB/s':>8}"
+        )
+        for encoding in compression.COMPRESSORS:
+            for level in LEVELS[encoding]:
+                timings = []
+                for _ in range(options["repeat"]):
+                    start = time.perf_counter()
+                    compressed = compression.compress(encoding, level, body)
+                    timings.append(time.perf_counter() - start)
+                elapsed = min(timings)
+                self.stdout.write(
+                    f"{encoding:<8} {level:>5} {len(compressed):>9} "
+                    f"{len(body) / len(compressed):>5.1f}x {elapsed * 1000:>8.2f} "
+                    f"{len(body) / elapsed / 1e6:>8.1f}"
+                )
+
+    def _payload(self, recipes, rng):
+        """Render a list shaped like `GET /api/recipe/recipes/`."""
+        tags = [{"id": i, "name": f"Tag {i}"} for i in range(1, 51)]
+        ingredients = [{"id": i, "name": f"Ingredient {i}"} for i in range(1, 201)]
+        data = [
+            {
+                "id": i,
+                "title": f"Recipe {i} with {rng.choice(ingredients)['name']}",
+                "time_minutes": rng.randint(5, 180),
+                "price": f"{rng.randint(100, 5000) / 100:.2f}",
+                "link": f"https://example.com/recipes/{i}",
+                "tags": sorted(rng.sample(tags, 3), key=lambda tag: tag["id"]),
+                "ingredients": sorted(
+                    rng.sample(ingredients, 6), key=lambda ingredient: ingredient["id"]
+                ),
+            }
+            for i in range(1, recipes + 1)
+        ]
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        return renderer.render(data)
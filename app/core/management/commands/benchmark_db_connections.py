@@ -0,0 +1,83 @@
+"""
+Django command to compare request latency across DB connection modes.
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+MODES = {
+    "per-request": {"CONN_MAX_AGE": 0, "POOL_MAX_SIZE": 0},
+    "pooled": {"CONN_MAX_AGE": 0, "POOL_MAX_SIZE": 4},
+    "persistent": {"CONN_MAX_AGE": 600, "POOL_MAX_SIZE": 0},
+}
+
+
+class Command(BaseCommand):
+    """
+    Time in-process requests against one endpoint with a new connection per
+    request, with pooling and with persistent connections.
+    """
+
+    help = "Benchmark request latency with and without connection pooling."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--url-name", default="recipe:tag-list")
+        parser.add_argument("--host", default="localhost")
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.create_user(
+            email="db-benchmark@example.com", password=None
+        )
+        token = Token.objects.create(user=user)
+        client = Client(
+            HTTP_HOST=options["host"],
+            HTTP_AUTHORIZATION=f"Token {token.key}",
+        )
+        url = reverse(options["url_name"])
+        original = {key: connection.settings_dict.get(key) for key in MODES["pooled"]}
+
+        # Throttled requests would time cheap 429 responses instead.
+        no_throttling = override_settings(
+            REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+        )
+        no_throttling.enable()
+        try:
+            self.stdout.write(
+                f"{'mode':<12} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}"
+            )
+            for mode, overrides in MODES.items():
+                connection.close()
+                connection.settings_dict.update(overrides)
+                self._get(client, url)  # Warm up caches and the pool.
+
+                timings = []
+                for _ in range(options["requests"]):
+                    start = time.perf_counter()
+                    self._get(client, url)
+                    timings.append((time.perf_counter() - start) * 1000)
+
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                self.stdout.write(
+                    f"{mode:<12} {statistics.median(timings):>8.2f} "
+                    f"{p95:>8.2f} {statistics.mean(timings):>8.2f}"
+                )
+        finally:
+            connection.close()
+            connection.settings_dict.update(original)
+            no_throttling.disable()
+            user.delete()
+
+    def _get(self, client, url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"GET {url} returned HTTP {response.status_code}.")
+        return response
@@ -0,0 +1,193 @@
+"""
+Django command to delete recipe image files that no recipe references.
+"""
+import itertools
+import os
+import tempfile
+import time
+from operator import itemgetter
+
+from core.models import ImageBlob, Recipe
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Collate
+
+UPLOAD_DIR = os.path.join("uploads", "recipe")
+VARIANT_DIR = os.path.join(UPLOAD_DIR, "variants")
+# Files are spread over on-disk buckets by this many leading name characters,
+# so only one bucket has to be sorted in memory at a time.
+BUCKET_PREFIX_LENGTH = 2
+
+
+class Command(BaseCommand):
+    """
+    Merge-join the sorted media directory against the sorted `Recipe.image`
+    column, deleting files (and variants) of images nothing points at.
+
+    Each orphan's `ImageBlob` row is locked, as `release_image` does, and the
+    references are counted again before its files and row are deleted; an
+    image attached meanwhile keeps both, with its count corrected. Zero-count
+    rows left behind by `release_image` are dropped too.
+    """
+
+    help = "Delete recipe image files no longer referenced by any recipe."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the files that would be deleted.",
+        )
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Keep orphans modified more recently than this, e.g. uploads "
+            "whose transaction has not committed yet.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of image names fetched from the database at once.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = time.time() - options["grace_hours"] * 3600
+        referenced = self._referenced_names(options["batch_size"])
+        current = next(referenced, None)
+        deleted = kept = freed = 0
+
+        for owner, entries in itertools.groupby(
+            self._sorted_files(), key=itemgetter(0)
+        ):
+            while current is not None and current < owner:
+                current = next(referenced, None)
+            if owner == current:
+                continue
+
+            orphans = []
+            for _, path in entries:
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if stat.st_mtime > cutoff:
+                    kept += 1
+                else:
+                    orphans.append((path, stat.st_size))
+            if not orphans:
+                continue
+
+            with transaction.atomic():
+                if owner and self._lock_unreferenced(owner, options["dry_run"]):
+                    continue
+                for path, size in orphans:
+                    if options["verbosity"] >= 2:
+                        self.stdout.write(f"Orphaned: {path}")
+                    if not options["dry_run"]:
+                        os.remove(path)
+                    deleted += 1
+                    freed += size
+
+        dropped = self._drop_unreferenced_blobs(options["dry_run"])
+        action = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} {deleted} files ({freed} bytes) and {dropped} image "
+                f"records, kept {kept} recent orphans."
+            )
+        )
+
+    def _lock_unreferenced(self, name, dry_run):
+        """
+        Lock the `ImageBlob` of `name` and delete it if no recipe uses the image.
+
+        Return whether a recipe does, in which case the files must be kept.
+        """
+        blob = ImageBlob.objects.select_for_update().filter(name=name).first()
+        references = Recipe.objects.filter(image=name).count()
+        if references:
+            if blob is not None and blob.ref_count != references and not dry_run:
+                blob.ref_count = references
+                blob.save(update_fields=["ref_count"])
+            return True
+        if blob is not None and not dry_run:
+            blob.delete()
+        return False
+
+    def _drop_unreferenced_blobs(self, dry_run):
+        """Delete zero-count `ImageBlob` rows no recipe uses, skipping locked ones."""
+        with transaction.atomic():
+            names = list(
+                ImageBlob.objects.select_for_update(skip_locked=True)
+                .filter(ref_count=0)
+                .filter(~Exists(Recipe.objects.filter(image=OuterRef("name"))))
+                .values_list("name", flat=True)
+            )
+            if not dry_run:
+                ImageBlob.objects.filter(name__in=names).delete()
+        return len(names)
+
+    def _referenced_names(self, batch_size):
+        # "C" collation makes the database order match Python string order.
+        return (
+            Recipe.objects.exclude(image="")
+            .exclude(image__isnull=True)
+            .order_by(Collate("image", "C"))
+            .values_list("image", flat=True)
+            .distinct()
+            .iterator(chunk_size=batch_size)
+        )
+
+    def _sorted_files(self):
+        """Yield `(owner image name, path)` for all media files, by owner."""
+        with tempfile.TemporaryDirectory() as bucket_dir:
+            buckets = {}
+            try:
+                for owner, path in self._scan_files():
+                    key = owner[: len(UPLOAD_DIR) + 1 + BUCKET_PREFIX_LENGTH]
+                    if key not in buckets:
+                        bucket_path = os.path.join(bucket_dir, str(len(buckets)))
+                        buckets[key] = open(bucket_path, "w+", encoding="utf-8")
+                    buckets[key].write(f"{owner}\t{path}\n")
+
+                for key in sorted(buckets):
+                    bucket = buckets[key]
+                    bucket.seek(0)
+                    entries = (line.rstrip("\n").split("\t", 1) for line in bucket)
+                    yield from sorted(entries)
+            finally:
+                for bucket in buckets.values():
+                    bucket.close()
+
+    def _scan_files(self):
+        for directory in (UPLOAD_DIR, VARIANT_DIR):
+            root = default_storage.path(directory)
+            if not os.path.isdir(root):
+                continue
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        owner = self._owner(directory, entry.name)
+                        yield owner, entry.path
+
+    def _owner(self, directory, filename):
+        """Name of the `Recipe.image` a file belongs to, "" if none can."""
+        if filename.endswith(".part"):
+            return ""
+        if directory == UPLOAD_DIR:
+            return os.path.join(UPLOAD_DIR, filename)
+
+        stem, ext = os.path.splitext(filename)
+        parts = stem.rsplit("_", 2)
+        if len(parts) != 3:
+            return ""
+        original, variant, size = parts
+        expected_size = settings.RECIPE_IMAGE_VARIANTS.get(variant)
+        if expected_size is None or size != "%dx%d" % expected_size:
+            return ""
+        return os.path.join(UPLOAD_DIR, original + ext)
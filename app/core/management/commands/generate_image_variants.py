@@ -0,0 +1,69 @@
+"""
+Django command to (re)generate resized variants for existing recipe images.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from core.models import Recipe
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from recipe.images import generate_variants
+
+
+class Command(BaseCommand):
+    """Backfill recipe image variants using a pool of workers."""
+
+    help = "Generate resized variants for every stored recipe image."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.RECIPE_IMAGE_WORKERS,
+            help="Number of images processed in parallel.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate variants that already exist.",
+        )
+
+    def handle(self, *args, **options):
+        names = (
+            Recipe.objects.exclude(image="")
+            .exclude(image__isnull=True)
+            .values_list("image", flat=True)
+            # Recipes share content-addressed images.
+            .distinct()
+            .iterator()
+        )
+        max_pending = options["workers"] * 4
+        pending = {}
+        self.processed = self.failed = 0
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            for name in names:
+                future = executor.submit(
+                    generate_variants, name, overwrite=options["force"]
+                )
+                pending[future] = name
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(done, pending)
+
+            self._collect(wait(pending).done, pending)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {self.processed} images, {self.failed} failed."
+            )
+        )
+
+    def _collect(self, futures, pending):
+        for future in futures:
+            name = pending.pop(future)
+            exc = future.exception()
+            if exc is None:
+                self.processed += 1
+            else:
+                self.failed += 1
+                self.stderr.write(f"Could not generate variants for {name}: {exc}")
@@ -0,0 +1,462 @@
+"""
+Django command to drive a weighted mix of API requests against a server.
+"""
+import gzip
+import http.client
+import io
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict, namedtuple
+from urllib.parse import urlencode, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from PIL import Image
+
+# Relative frequency of each operation in the default mix.
+DEFAULT_MIX = {
+    "recipe-list": 20,
+    "recipe-list-filtered": 10,
+    "recipe-search": 8,
+    "recipe-detail": 20,
+    "recipe-create": 6,
+    "recipe-partial-update": 6,
+    "recipe-upload-image": 2,
+    "tag-list": 8,
+    "tag-partial-update": 2,
+    "tag-destroy": 1,
+    "ingredient-list": 8,
+    "ingredient-partial-update": 2,
+    "ingredient-destroy": 1,
+    "token": 6,
+}
+
+# Longest pause after operations that had nothing to act on, in seconds.
+MAX_SKIP_BACKOFF = 0.05
+
+SEARCH_TERMS = ["chicken", "soup", "spicy", "rice", "quick", "tomato", "vegan"]
+
+Call = namedtuple("Call", "method path body content_type on_success")
+Call.__new__.__defaults__ = (None, None, None)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    index = max(
+        0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+def random_jpeg(rng):
+    """A small JPEG that differs per call, as image storage is content addressed."""
+    image = Image.new("RGB", (64, 64), tuple(rng.randrange(256) for _ in range(3)))
+    image.putpixel((0, 0), tuple(rng.randrange(256) for _ in range(3)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class Worker:
+    """One simulated client with its own connection, token and known objects."""
+
+    def __init__(self, number, base_url, email, password, options):
+        self.number = number
+        self.email = email
+        self.password = password
+        self.compress = options["compress"]
+        self.rng = random.Random(f"{options['seed']}-{number}")
+        url = urlsplit(base_url)
+        connection_class = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.connection = connection_class(url.netloc, timeout=options["timeout"])
+        self.token = None
+        self.recipe_ids, self.tag_ids, self.ingredient_ids = [], [], []
+        # Tags and ingredients this worker created, safe to rename or delete.
+        self.own = {"tag": [], "ingredient": []}
+        self.created = 0
+
+    def send(self, call):
+        headers = {"Accept": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Token {self.token}"
+        if self.compress:
+            headers["Accept-Encoding"] = "gzip"
+        body = call.body
+        if body is not None and call.content_type is None:
+            body = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        elif call.content_type is not None:
+            headers["Content-Type"] = call.content_type
+        try:
+            self.connection.request(call.method, call.path, body, headers)
+            response = self.connection.getresponse()
+            content = response.read()
+            if response.getheader("Content-Encoding") == "gzip":
+                content = gzip.decompress(content)
+        except (OSError, EOFError, http.client.HTTPException):
+            self.connection.close()
+            return None, None
+        return response.status, content
+
+    def perform(self, call):
+        status, content = self.send(call)
+        if status is not None and 200 <= status < 300 and call.on_success:
+            call.on_success(content)
+        return status, content
+
+    def set_up(self):
+        """Log in (signing up first if needed) and learn some object ids."""
+        status, _ = self.perform(self.login())
+        if status != 200:
+            self.send(
+                Call(
+                    "POST",
+                    reverse("user:create"),
+                    {"email": self.email, "password": self.password, "name": "Load"},
+                )
+            )
+            status, _ = self.perform(self.login())
+        if status != 200:
+            raise CommandError(f"Could not log in as {self.email} (HTTP {status}).")
+
+        status, content = self.send(self.recipe_list({"page_size": 100}))
+        if status == 200:
+            self.recipe_ids.extend(item["id"] for item in self._results(content))
+        if not self.recipe_ids:
+            self.perform(self.recipe_create())
+        for kind in ("tag", "ingredient"):
+            status, content = self.send(self.attr_list(kind, {"page_size": 100}))
+            if status == 200:
+                ids = getattr(self, f"{kind}_ids")
+                ids.extend(item["id"] for item in self._results(content))
+
+    @staticmethod
+    def _results(content):
+        data = json.loads(content)
+        return data["results"] if isinstance(data, dict) else data
+
+    # Operations: each returns the single request to time, or None to skip.
+
+    def login(self):
+        def on_success(content):
+            self.token = json.loads(content)["token"]
+
+        return Call(
+            "POST",
+            reverse("user:token"),
+            {"email": self.email, "password": self.password},
+            on_success=on_success,
+        )
+
+    def recipe_list(self, params=None):
+        # Page through recipes like the apps do, rather than fetching all.
+        params = {"page_size": 20, **(params or {})}
+        return Call("GET", self._url("recipe:recipe-list", params=params))
+
+    def recipe_list_filtered(self):
+        params = {}
+        if self.tag_ids:
+            params["tags"] = self.rng.choice(self.tag_ids)
+        if self.ingredient_ids:
+            params["ingredients"] = ",".join(
+                str(pk) for pk in self._sample(self.ingredient_ids, 2)
+            )
+        return self.recipe_list(params)
+
+    def recipe_search(self):
+        return self.recipe_list({"search": self.rng.choice(SEARCH_TERMS)})
+
+    def recipe_detail(self):
+        if self.recipe_ids:
+            return Call("GET", self._detail_url("recipe", self.recipe_ids))
+
+    def recipe_create(self):
+        self.created += 1
+        name = f"load {self.number}-{self.created}"
+
+        def on_success(content):
+            data = json.loads(content)
+            self.recipe_ids.append(data["id"])
+            for kind in ("tag", "ingredient"):
+                for item in data[f"{kind}s"]:
+                    getattr(self, f"{kind}_ids").append(item["id"])
+                    if item["name"] == name:
+                        self.own[kind].append(item["id"])
+
+        return Call(
+            "POST",
+            self._url("recipe:recipe-list"),
+            {
+                "title": f"Load test recipe {name}",
+                "time_minutes": self.rng.randint(5, 120),
+                "price": f"{self.rng.randint(100, 5000) / 100:.2f}",
+                "tags": [{"name": name}, {"name": "load"}],
+                "ingredients": [{"name": name}, {"name": "salt"}],
+            },
+            on_success=on_success,
+        )
+
+    def recipe_partial_update(self):
+        if self.recipe_ids:
+            return Call(
+                "PATCH",
+                self._detail_url("recipe", self.recipe_ids),
+                {"time_minutes": self.rng.randint(5, 120)},
+            )
+
+    def recipe_upload_image(self):
+        if not self.recipe_ids:
+            return None
+        boundary = uuid.uuid4().hex
+        body = b"".join(
+            [
+                f"--{boundary}\r\n".encode(),
+                b'Content-Disposition: form-data; name="image"; filename="load.jpg"\r\n',
+                b"Content-Type: image/jpeg\r\n\r\n",
+                random_jpeg(self.rng),
+                f"\r\n--{boundary}--\r\n".encode(),
+            ]
+        )
+        recipe_id = self.rng.choice(self.recipe_ids)
+        return Call(
+            "POST",
+            reverse("recipe:recipe-upload-image", args=[recipe_id]),
+            body,
+            f"multipart/form-data; boundary={boundary}",
+        )
+
+    def attr_list(self, kind, params=None):
+        params = {"page_size": 20, **(params or {})}
+        return Call("GET", self._url(f"recipe:{kind}-list", params=params))
+
+    def attr_partial_update(self, kind):
+        if self.own[kind]:
+            self.created += 1
+            return Call(
+                "PATCH",
+                self._detail_url(kind, self.own[kind]),
+                {"name": f"load {self.number}-{self.created}"},
+            )
+
+    def attr_destroy(self, kind):
+        if self.own[kind]:
+            pk = self.own[kind].pop(self.rng.randrange(len(self.own[kind])))
+            getattr(self, f"{kind}_ids").remove(pk)
+            return Call("DELETE", reverse(f"recipe:{kind}-detail", args=[pk]))
+
+    def operations(self):
+        return {
+            "recipe-list": self.recipe_list,
+            "recipe-list-filtered": self.recipe_list_filtered,
+            "recipe-search": self.recipe_search,
+            "recipe-detail": self.recipe_detail,
+            "recipe-create": self.recipe_create,
+            "recipe-partial-update": self.recipe_partial_update,
+            "recipe-upload-image": self.recipe_upload_image,
+            "tag-list": lambda: self.attr_list("tag"),
+            "tag-partial-update": lambda: self.attr_partial_update("tag"),
+            "tag-destroy": lambda: self.attr_destroy("tag"),
+            "ingredient-list": lambda: self.attr_list("ingredient"),
+            "ingredient-partial-update": lambda: self.attr_partial_update("ingredient"),
+            "ingredient-destroy": lambda: self.attr_destroy("ingredient"),
+            "token": self.login,
+        }
+
+    def _url(self, name, args=None, params=None):
+        url = reverse(name, args=args)
+        return f"{url}?{urlencode(params)}" if params else url
+
+    def _detail_url(self, kind, ids):
+        return reverse(f"recipe:{kind}-detail", args=[self.rng.choice(ids)])
+
+    def _sample(self, ids, count):
+        return self.rng.sample(ids, min(count, len(ids)))
+
+    def run(self, mix, deadline, max_requests, results, skipped):
+        names, weights = list(mix), list(mix.values())
+        operations = self.operations()
+        sent = consecutive_skips = 0
+        while time.monotonic() < deadline and sent < max_requests:
+            name = self.rng.choices(names, weights)[0]
+            call = operations[name]()
+            if call is None:
+                # E.g. nothing of its own to delete yet. Back off, rather than
+                # spin, when the mix only has such operations left.
+                skipped[name] += 1
+                consecutive_skips += 1
+                time.sleep(min(MAX_SKIP_BACKOFF, 0.001 * consecutive_skips))
+                continue
+            consecutive_skips = 0
+            start = time.perf_counter()
+            status, content = self.send(call)
+            results[name].append((time.perf_counter() - start, status))
+            sent += 1
+            if status is not None and 200 <= status < 300 and call.on_success:
+                call.on_success(content)
+
+
+class Command(BaseCommand):
+    """
+    Replay a weighted mix of API operations from concurrent clients and report
+    latency percentiles and throughput per operation.
+
+    Each client logs in as `<email-prefix><n>@example.com`, signing up first
+    if that user does not exist, so it also works with users from
+    `seed_data`. Raise the server's THROTTLE_*_RATE settings, or the report
+    will mostly measure 429 responses.
+    """
+
+    help = "Load test a running server with a weighted mix of API requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://localhost:8000")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=None,
+            help="Seconds, 30 unless --requests is given.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=None,
+            help="Stop each client after this many requests.",
+        )
+        parser.add_argument(
+            "--mix",
+            default="",
+            help="Operation weights overriding the default mix, e.g. "
+            "'recipe-list=50,token=0'.",
+        )
+        parser.add_argument("--email-prefix", default="load-user-")
+        parser.add_argument("--password", default="seedpass123")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument(
+            "--compress", action="store_true", help="Accept gzip responses."
+        )
+        parser.add_argument("--output", help="Also write the report as JSON here.")
+
+    def handle(self, *args, **options):
+        mix = {**DEFAULT_MIX, **self._parse_mix(options["mix"])}
+        mix = {name: weight for name, weight in mix.items() if weight > 0}
+        if not mix:
+            raise CommandError("The operation mix is empty.")
+
+        workers = [
+            Worker(
+                number,
+                options["url"],
+                f"{options['email_prefix']}{number}@example.com",
+                options["password"],
+                options,
+            )
+            for number in range(options["concurrency"])
+        ]
+        for worker in workers:
+            worker.set_up()
+
+        duration = options["duration"]
+        if duration is None:
+            duration = float("inf") if options["requests"] else 30
+        results = [defaultdict(list) for _ in workers]
+        skipped = [Counter() for _ in workers]
+        start = time.monotonic()
+        threads = [
+            threading.Thread(
+                target=worker.run,
+                args=(
+                    mix,
+                    start + duration,
+                    options["requests"] or float("inf"),
+                    worker_results,
+                    worker_skipped,
+                ),
+            )
+            for worker, worker_results, worker_skipped in zip(workers, results, skipped)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        merged = defaultdict(list)
+        for worker_results in results:
+            for name, samples in worker_results.items():
+                merged[name].extend(samples)
+        report = self._report(merged, elapsed)
+        skipped = dict(sorted(sum(skipped, Counter()).items()))
+        self._write(report, skipped, elapsed)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(
+                    {"duration": elapsed, "operations": report, "skipped": skipped},
+                    f,
+                    indent=2,
+                )
+
+    def _parse_mix(self, value):
+        mix = {}
+        for item in filter(None, value.split(",")):
+            name, _, weight = item.partition("=")
+            name = name.strip()
+            if name not in DEFAULT_MIX:
+                raise CommandError(
+                    f"Unknown operation {name!r}, use one of: " + ", ".join(DEFAULT_MIX)
+                )
+            try:
+                mix[name] = float(weight)
+            except ValueError:
+                raise CommandError(f"Invalid weight for {name!r}: {weight!r}")
+        return mix
+
+    def _report(self, samples_by_name, elapsed):
+        report = {}
+        for name in sorted(samples_by_name):
+            samples = samples_by_name[name]
+            latencies = sorted(latency * 1000 for latency, _ in samples)
+            statuses = defaultdict(int)
+            for _, status in samples:
+                statuses[str(status or "error")] += 1
+            report[name] = {
+                "requests": len(samples),
+                "throughput": len(samples) / elapsed,
+                "p50_ms": percentile(latencies, 0.50),
+                "p95_ms": percentile(latencies, 0.95),
+                "p99_ms": percentile(latencies, 0.99),
+                "statuses": dict(sorted(statuses.items())),
+            }
+        return report
+
+    def _write(self, report, skipped, elapsed):
+        self.stdout.write(
+            f"{'operation':<26} {'requests':>8} {'req/s':>8} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8}  statuses"
+        )
+        for name, row in report.items():
+            statuses = " ".join(
+                f"{status}:{count}" for status, count in row["statuses"].items()
+            )
+            self.stdout.write(
+                f"{name:<26} {row['requests']:>8} {row['throughput']:>8.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+                f"  {statuses}"
+            )
+        total = sum(row["requests"] for row in report.values())
+        self.stdout.write(
+            f"{'total':<26} {total:>8} {total / elapsed:>8.1f}  in {elapsed:.1f}s"
+        )
+        if skipped:
+            self.stdout.write(
+                "Skipped for lack of objects: "
+                + " ".join(f"{name}:{count}" for name, count in skipped.items())
+            )
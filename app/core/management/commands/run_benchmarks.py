@@ -0,0 +1,124 @@
+"""
+Django command to run the benchmark suites and check them against baselines.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.runner import DiscoverRunner
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils.module_loading import autodiscover_modules
+from utils import benchmark
+
+
+class Command(BaseCommand):
+    """
+    Time every `bench_*` method of the suites in `<app>/tests/benchmarks.py`
+    on a throwaway test database.
+
+    Times may exceed the baseline by `--threshold`, query counts may not grow
+    at all. Slow benchmarks are rerun `--retries` times before they count as
+    regressions. Baselines depend on the machine, so they are not committed:
+    record one with `--save` (`make benchmark-baseline`) on the machine that
+    runs the comparison, e.g. before starting a change.
+    """
+
+    help = "Run the benchmark suites and fail on regressions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--baseline", default=str(settings.BASE_DIR / "benchmarks.json")
+        )
+        parser.add_argument("--threshold", type=float, default=0.25)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument("--retries", type=int, default=2)
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", help="Override the suites' sizes."
+        )
+        parser.add_argument(
+            "-k", dest="pattern", default="", help="Only run matching benchmarks."
+        )
+        parser.add_argument(
+            "--save", action="store_true", help="Record the results as baseline."
+        )
+
+    def handle(self, *args, **options):
+        autodiscover_modules("tests.benchmarks")
+        baseline = benchmark.load_baseline(options["baseline"])
+
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            # Benchmarks repeat requests far faster than clients may.
+            with override_settings(
+                REST_FRAMEWORK={
+                    **settings.REST_FRAMEWORK,
+                    "DEFAULT_THROTTLE_RATES": {},
+                }
+            ):
+                results = self._run(options, baseline)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        if options["save"]:
+            benchmark.save_baseline(options["baseline"], {**baseline, **results})
+            self.stdout.write(f"Saved {len(results)} results to {options['baseline']}")
+            return
+
+        if not baseline:
+            self.stdout.write(
+                f"No baseline at {options['baseline']}, record one with --save."
+            )
+        regressions = []
+        for name, result in results.items():
+            line = f"{name:<80} {result['best_ms']:>9.2f} ms {result['queries']:>3} q"
+            if name not in baseline:
+                self.stdout.write(f"{line}  (no baseline)")
+                continue
+            change = result["best_ms"] / baseline[name]["best_ms"] - 1
+            problems = benchmark.compare(baseline[name], result, options["threshold"])
+            if problems:
+                regressions.append(name)
+                self.stdout.write(
+                    self.style.ERROR(f"{line} {change:>+7.0%}  " + "; ".join(problems))
+                )
+            else:
+                self.stdout.write(f"{line} {change:>+7.0%}")
+
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} benchmark(s) regressed: " + ", ".join(regressions)
+            )
+
+    def _run(self, options, baseline):
+        def run(select):
+            return dict(
+                benchmark.run_suites(
+                    benchmark.SUITES,
+                    repeat=options["repeat"],
+                    sizes=options["sizes"],
+                    select=select,
+                )
+            )
+
+        results = run(lambda name: options["pattern"] in name)
+        if options["save"]:
+            return results
+
+        for _ in range(options["retries"]):
+            suspects = {
+                name
+                for name, result in results.items()
+                if name in baseline
+                and benchmark.compare(baseline[name], result, options["threshold"])
+            }
+            if not suspects:
+                break
+            for name, result in run(suspects.__contains__).items():
+                if result["best_ms"] < results[name]["best_ms"]:
+                    results[name] = result
+        return results
@@ -0,0 +1,333 @@
+"""
+Django command to fill the database with synthetic users and recipes.
+"""
+import io
+import itertools
+import random
+import time
+from collections import Counter
+from decimal import Decimal
+
+from core.models import ChangeVersion, Ingredient, Recipe, Tag
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+ADJECTIVES = (
+    "Classic Crispy Creamy Easy Grilled Hearty Quick Roasted Smoky Spicy Sticky "
+    "Zesty"
+).split()
+DISHES = (
+    "bake bowl curry pasta pie risotto salad sandwich soup stew stir-fry tacos"
+).split()
+INGREDIENT_WORDS = (
+    "apple basil bean beef broccoli butter carrot cheese chicken chickpea chili "
+    "coconut cod corn egg garlic ginger honey kale lemon lentil lime mushroom "
+    "noodle onion pepper pork potato prawn rice salmon spinach tofu tomato yogurt "
+    "zucchini"
+).split()
+TAG_WORDS = (
+    "breakfast dessert dinner gluten-free healthy holiday kids lunch meal-prep "
+    "one-pot party snack summer vegan vegetarian weeknight winter"
+).split()
+
+# Characters with a meaning in COPY's text format.
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def vocabulary(words, size):
+    """`size` distinct names, cycling through `words` with numbered repeats."""
+    return [
+        words[i % len(words)] + (f" {i // len(words) + 1}" if i >= len(words) else "")
+        for i in range(size)
+    ]
+
+
+def zipf_weights(size):
+    """Cumulative weights making the first names the most popular, as in real data."""
+    return list(itertools.accumulate(1 / rank for rank in range(1, size + 1)))
+
+
+class BulkCreateWriter:
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+
+    def write(self, model, rows):
+        model.objects.bulk_create(
+            (model(**row) for row in rows), batch_size=self.batch_size
+        )
+
+
+class CopyWriter:
+    """Load rows with Postgres `COPY ... FROM STDIN` in text format."""
+
+    def write(self, model, rows):
+        if not rows:
+            return
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if not field.primary_key or field.attname in rows[0]
+        ]
+        # Rows hold values psycopg2 would send as is, so skip field preparation.
+        defaults = [(field.attname, field.get_default()) for field in fields]
+        format_value = self._format
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(
+                "\t".join(
+                    format_value(row.get(attname, default))
+                    for attname, default in defaults
+                )
+            )
+            buffer.write("\n")
+        buffer.seek(0)
+
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {connection.ops.quote_name(model._meta.db_table)} "
+                f"({columns}) FROM STDIN",
+                buffer,
+            )
+
+    @staticmethod
+    def _format(value):
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        return str(value).translate(COPY_ESCAPES)
+
+
+def reserve_ids(model, count):
+    """Take `count` ids from the model's sequence so rows can reference each other."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) "
+            "FROM generate_series(1, %s)",
+            [model._meta.db_table, count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+class Command(BaseCommand):
+    """
+    Generate users with their own tag and ingredient vocabularies and recipes
+    linked to them, writing each batch of users with `COPY` (or
+    `bulk_create`) in its own transaction.
+
+    The same options and `--seed` produce the same data. Every user gets the
+    same password, hashed once.
+    """
+
+    help = "Seed the database with synthetic users, recipes, tags and ingredients."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--recipes-per-user", type=int, default=100)
+        parser.add_argument(
+            "--tags", type=int, default=30, help="Tag vocabulary size per user."
+        )
+        parser.add_argument(
+            "--ingredients",
+            type=int,
+            default=100,
+            help="Ingredient vocabulary size per user.",
+        )
+        parser.add_argument(
+            "--tags-per-recipe",
+            type=float,
+            default=2,
+            help="Average number of tags linked to a recipe.",
+        )
+        parser.add_argument(
+            "--ingredients-per-recipe",
+            type=float,
+            default=6,
+            help="Average number of ingredients linked to a recipe.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Recipes written per transaction.",
+        )
+        parser.add_argument("--method", choices=["copy", "bulk"], default="copy")
+        parser.add_argument("--email-prefix", default="seed-user-")
+        parser.add_argument("--password", default="seedpass123")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        if User.objects.filter(email__startswith=options["email_prefix"]).exists():
+            raise CommandError(
+                f"Users starting with {options['email_prefix']!r} already exist, "
+                "pass another --email-prefix."
+            )
+        if options["tags_per_recipe"] > options["tags"] or (
+            options["ingredients_per_recipe"] > options["ingredients"]
+        ):
+            raise CommandError("Recipes cannot link more names than a user has.")
+
+        self.options = options
+        self.rng = random.Random(options["seed"])
+        self.password = make_password(options["password"])
+        self.tag_names = vocabulary(TAG_WORDS, options["tags"])
+        self.ingredient_names = vocabulary(INGREDIENT_WORDS, options["ingredients"])
+        self.tag_weights = zipf_weights(options["tags"])
+        self.ingredient_weights = zipf_weights(options["ingredients"])
+        writer = (
+            CopyWriter()
+            if options["method"] == "copy"
+            else BulkCreateWriter(options["batch_size"])
+        )
+
+        users_per_batch = max(
+            1, options["batch_size"] // max(1, options["recipes_per_user"])
+        )
+        self.stats = Counter()
+        start = time.perf_counter()
+        for first in range(0, options["users"], users_per_batch):
+            count = min(users_per_batch, options["users"] - first)
+            with transaction.atomic():
+                for model, rows in self._generate(first, count):
+                    writer.write(model, rows)
+                    self.stats[model._meta.label] += len(rows)
+
+            elapsed = time.perf_counter() - start
+            recipes = self.stats[Recipe._meta.label]
+            self.stdout.write(
+                f"{first + count}/{options['users']} users, {recipes} recipes, "
+                f"{sum(self.stats.values())} rows in {elapsed:.1f}s "
+                f"({recipes / elapsed:.0f} recipes/s)"
+            )
+
+        # Fresh planner statistics, so the first queries use the indexes.
+        with connection.cursor() as cursor:
+            for model in (
+                User,
+                Tag,
+                Ingredient,
+                Recipe,
+                Recipe.tags.through,
+                Recipe.ingredients.through,
+            ):
+                cursor.execute(
+                    f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}"
+                )
+        self.stdout.write(
+            self.style.SUCCESS(
+                ", ".join(f"{count} {label}" for label, count in self.stats.items())
+            )
+        )
+
+    def _generate(self, first, count):
+        """Rows for users `first` to `first + count`, in insertion order."""
+        options = self.options
+        recipes_per_user = options["recipes_per_user"]
+        user_ids = reserve_ids(get_user_model(), count)
+        tag_ids = reserve_ids(Tag, count * options["tags"])
+        ingredient_ids = reserve_ids(Ingredient, count * options["ingredients"])
+        recipe_ids = reserve_ids(Recipe, count * recipes_per_user)
+
+        users, tags, ingredients, recipes = [], [], [], []
+        recipe_tags, recipe_ingredients = [], []
+        for n, user_id in enumerate(user_ids):
+            users.append(
+                {
+                    "id": user_id,
+                    "email": f"{options['email_prefix']}{first + n}@example.com",
+                    "name": f"Seed user {first + n}",
+                    "password": self.password,
+                }
+            )
+            user_tag_ids = tag_ids[n * options["tags"] : (n + 1) * options["tags"]]
+            user_ingredient_ids = ingredient_ids[
+                n * options["ingredients"] : (n + 1) * options["ingredients"]
+            ]
+            tag_counts, ingredient_counts = Counter(), Counter()
+
+            for recipe_id in recipe_ids[
+                n * recipes_per_user : (n + 1) * recipes_per_user
+            ]:
+                picked_tags = self._pick(options["tags_per_recipe"], self.tag_weights)
+                picked_ingredients = self._pick(
+                    options["ingredients_per_recipe"], self.ingredient_weights
+                )
+                tag_counts.update(picked_tags)
+                ingredient_counts.update(picked_ingredients)
+                recipe_tags.extend(
+                    {"recipe_id": recipe_id, "tag_id": user_tag_ids[i]}
+                    for i in picked_tags
+                )
+                recipe_ingredients.extend(
+                    {"recipe_id": recipe_id, "ingredient_id": user_ingredient_ids[i]}
+                    for i in picked_ingredients
+                )
+                recipes.append(self._recipe(recipe_id, user_id, picked_ingredients))
+
+            tags.extend(
+                {
+                    "id": tag_id,
+                    "user_id": user_id,
+                    "name": self.tag_names[i],
+                    "recipe_count": tag_counts[i],
+                }
+                for i, tag_id in enumerate(user_tag_ids)
+            )
+            ingredients.extend(
+                {
+                    "id": ingredient_id,
+                    "user_id": user_id,
+                    "name": self.ingredient_names[i],
+                    "recipe_count": ingredient_counts[i],
+                }
+                for i, ingredient_id in enumerate(user_ingredient_ids)
+            )
+
+        return [
+            (get_user_model(), users),
+            # Signals do not run, so create the rows ETags are derived from.
+            (ChangeVersion, [{"user_id": user["id"]} for user in users]),
+            (Tag, tags),
+            (Ingredient, ingredients),
+            (Recipe, recipes),
+            (Recipe.tags.through, recipe_tags),
+            (Recipe.ingredients.through, recipe_ingredients),
+        ]
+
+    def _pick(self, average, cum_weights):
+        """Distinct popularity-weighted indexes, `average` of them on average."""
+        count = self.rng.randint(0, round(2 * average))
+        count = min(count, len(cum_weights))
+        picked = set()
+        while len(picked) < count:
+            picked.update(
+                self.rng.choices(
+                    range(len(cum_weights)),
+                    cum_weights=cum_weights,
+                    k=count - len(picked),
+                )
+            )
+        return sorted(picked)
+
+    def _recipe(self, recipe_id, user_id, ingredient_indexes):
+        rng = self.rng
+        main = (
+            self.ingredient_names[ingredient_indexes[0]]
+            if ingredient_indexes
+            else rng.choice(INGREDIENT_WORDS)
+        )
+        title = f"{rng.choice(ADJECTIVES)} {main} {rng.choice(DISHES)}"
+        return {
+            "id": recipe_id,
+            "user_id": user_id,
+            "title": title,
+            "description": f"{title} for {rng.randint(1, 8)}. "
+            + " ".join(rng.choices(INGREDIENT_WORDS, k=rng.randint(5, 30))),
+            "time_minutes": rng.randint(5, 240),
+            "price": Decimal(rng.randint(50, 9999)) / 100,
+            "link": f"https://example.com/recipes/{recipe_id}",
+        }
@@ -0,0 +1,98 @@
+import hashlib
+
+from core import compression
+from core.db.routers import replica_reads
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Allow replica reads for safe requests, except from clients that issued a
+    write within the last `DATABASE_REPLICA_STICKY_SECONDS`, so they read
+    their own writes despite replication lag.
+    """
+
+    key_prefix = "replica-sticky:"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cache = caches[settings.DATABASE_REPLICA_STICKY_CACHE]
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = self.sticky_key(request)
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            # Start the window once the write has committed.
+            self.cache.set(key, True, settings.DATABASE_REPLICA_STICKY_SECONDS)
+            return response
+
+        token = replica_reads.set(not self.cache.get(key, False))
+        try:
+            return self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+
+    def sticky_key(self, request):
+        """Identify the client by its credentials, falling back to its IP."""
+        client = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(
+            settings.SESSION_COOKIE_NAME, request.META.get("REMOTE_ADDR", "")
+        )
+        return self.key_prefix + hashlib.sha1(client.encode()).hexdigest()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding the client accepts.
+
+    Streaming responses are compressed chunk by chunk, so data still reaches
+    the client incrementally.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        options = settings.RESPONSE_COMPRESSION
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        if (
+            response.has_header("Content-Encoding")
+            or content_type not in options["CONTENT_TYPES"]
+            or (not response.streaming and len(response.content) < options["MIN_SIZE"])
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = compression.select_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+        if encoding is None:
+            return response
+
+        level = options["LEVELS"][encoding]
+        if response.streaming:
+            response.streaming_content = compression.compress_sequence(
+                encoding, level, response.streaming_content
+            )
+            del response["Content-Length"]
+        else:
+            compressed = compression.compress(encoding, level, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # The compressed body is a different representation, so a strong
+        # ETag would be wrong for it.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
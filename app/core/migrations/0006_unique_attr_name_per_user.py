@@ -0,0 +1,49 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:02
+
+from django.db import migrations, models
+
+
+def merge_duplicate_names(apps, schema_editor):
+    """Point recipes at the oldest of each duplicated tag/ingredient."""
+    Recipe = apps.get_model("core", "Recipe")
+    for model_name, field_name in (("Tag", "tags"), ("Ingredient", "ingredients")):
+        model = apps.get_model("core", model_name)
+        through = getattr(Recipe, field_name).through
+        fk_name = f"{model_name.lower()}_id"
+        keep = {}
+        for obj in model.objects.order_by("id").iterator():
+            key = (obj.user_id, obj.name)
+            if key not in keep:
+                keep[key] = obj.id
+                continue
+
+            kept_id = keep[key]
+            linked = through.objects.filter(**{fk_name: kept_id}).values_list(
+                "recipe_id", flat=True
+            )
+            through.objects.filter(**{fk_name: obj.id}).exclude(
+                recipe_id__in=linked
+            ).update(**{fk_name: kept_id})
+            obj.delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_recipe_image"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_names, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="ingredient",
+            constraint=models.UniqueConstraint(
+                fields=("user", "name"), name="unique_ingredient_name_per_user"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="tag",
+            constraint=models.UniqueConstraint(
+                fields=("user", "name"), name="unique_tag_name_per_user"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0006_unique_attr_name_per_user"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="recipe",
+            index=models.Index(fields=["user", "-id"], name="recipe_user_id_desc_idx"),
+        ),
+        # Tag/Ingredient (user, name) lookups are served by the unique
+        # constraints added in 0006. The auto-created M2M tables only index
+        # (recipe_id, attr_id), so add the reverse order for attr -> recipe.
+        migrations.RunSQL(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS core_recipe_tags_tag_recipe_idx "
+            "ON core_recipe_tags (tag_id, recipe_id);",
+            "DROP INDEX CONCURRENTLY IF EXISTS core_recipe_tags_tag_recipe_idx;",
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "core_recipe_ingredients_ingredient_recipe_idx "
+            "ON core_recipe_ingredients (ingredient_id, recipe_id);",
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            "core_recipe_ingredients_ingredient_recipe_idx;",
+        ),
+    ]
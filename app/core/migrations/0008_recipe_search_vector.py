@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_recipe_access_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE core_recipe ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', title), 'A')
+                || setweight(to_tsvector('english', description), 'B')
+            ) STORED;
+            CREATE INDEX core_recipe_search_vector_idx
+            ON core_recipe USING GIN (search_vector);
+            """,
+            """
+            DROP INDEX core_recipe_search_vector_idx;
+            ALTER TABLE core_recipe DROP COLUMN search_vector;
+            """,
+        ),
+    ]
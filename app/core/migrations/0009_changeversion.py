@@ -0,0 +1,43 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_change_versions(apps, schema_editor):
+    User = apps.get_model("core", "User")
+    ChangeVersion = apps.get_model("core", "ChangeVersion")
+    ChangeVersion.objects.bulk_create(
+        (
+            ChangeVersion(user_id=user_id)
+            for user_id in User.objects.values_list("id", flat=True).iterator()
+        ),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0008_recipe_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeVersion",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("version", models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_change_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:22
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_images(apps, schema_editor):
+    Recipe = apps.get_model("core", "Recipe")
+    ImageBlob = apps.get_model("core", "ImageBlob")
+    counts = (
+        Recipe.objects.exclude(image="")
+        .exclude(image__isnull=True)
+        .values("image")
+        .annotate(ref_count=Count("id"))
+    )
+    ImageBlob.objects.bulk_create(
+        (ImageBlob(name=row["image"], ref_count=row["ref_count"]) for row in counts),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0009_changeversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageBlob",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_existing_images, migrations.RunPython.noop),
+    ]
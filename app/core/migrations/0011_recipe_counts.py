@@ -0,0 +1,70 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:35
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+BACKFILL_SQL = """
+UPDATE core_{model} SET recipe_count = counts.recipe_count
+FROM (
+    SELECT {model}_id, COUNT(*) AS recipe_count
+    FROM core_recipe_{field} GROUP BY {model}_id
+) AS counts
+WHERE counts.{model}_id = core_{model}.id;
+"""
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0010_imageblob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingredient",
+            name="recipe_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="recipe_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            BACKFILL_SQL.format(model="tag", field="tags"), migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            BACKFILL_SQL.format(model="ingredient", field="ingredients"),
+            migrations.RunSQL.noop,
+        ),
+        AddIndexConcurrently(
+            model_name="ingredient",
+            index=models.Index(
+                condition=models.Q(("recipe_count__gt", 0)),
+                fields=["user", "-name"],
+                name="ingredient_assigned_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ingredient",
+            index=models.Index(
+                fields=["user", "-recipe_count", "-name"],
+                name="ingredient_popular_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="tag",
+            index=models.Index(
+                condition=models.Q(("recipe_count__gt", 0)),
+                fields=["user", "-name"],
+                name="tag_assigned_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="tag",
+            index=models.Index(
+                fields=["user", "-recipe_count", "-name"], name="tag_popular_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.0.10 on 2026-10-17 09:12
+
+from django.db import migrations
+
+# Django's single-column indexes on the M2M tables' attr foreign keys are
+# prefixes of the (attr_id, recipe_id) indexes added in 0007, which serve the
+# same lookups and also cover recipe_id.
+REDUNDANT_INDEXES = [
+    ("core_recipe_tags_tag_id_10c0ffea", "core_recipe_tags", "tag_id"),
+    (
+        "core_recipe_ingredients_ingredient_id_a8fec9ee",
+        "core_recipe_ingredients",
+        "ingredient_id",
+    ),
+]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0011_recipe_counts"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {name};",
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column});",
+        )
+        for name, table, column in REDUNDANT_INDEXES
+    ]
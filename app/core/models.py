@@ -1,5 +1,6 @@
 import os
 import uuid
+from collections import defaultdict
 from typing import Optional
 
 from django.conf import settings
@@ -8,7 +9,11 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
 from django.db import models
+from django.db.models import F, FloatField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
 
 
 def recipe_image_file_path(instance, filename):
@@ -18,6 +23,18 @@ def recipe_image_file_path(instance, filename):
     return os.path.join("uploads", "recipe", filename)
 
 
+def recipe_image_content_path(digest, ext):
+    return os.path.join("uploads", "recipe", digest + ext)
+
+
+def recipe_image_variant_path(name, variant):
+    stem, ext = os.path.splitext(os.path.basename(name))
+    width, height = settings.RECIPE_IMAGE_VARIANTS[variant]
+    filename = f"{stem}_{variant}_{width}x{height}{ext}"
+
+    return os.path.join("uploads", "recipe", "variants", filename)
+
+
 class UserManager(BaseUserManager):
     def create_user(self, email: str, password: Optional[str] = None, **extra_fields):
         if not email:
@@ -49,6 +66,24 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
 
 
+SEARCH_CONFIG = "english"
+# Generated tsvector column maintained by Postgres, see migration 0008.
+SEARCH_VECTOR = RawSQL('"core_recipe"."search_vector"', [], SearchVectorField())
+
+
+class RecipeQuerySet(models.QuerySet):
+    def search(self, text: str):
+        """Filter by full-text match on title/description, annotating rank."""
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        return (
+            self.alias(search_vector=SEARCH_VECTOR)
+            .filter(search_vector=query)
+            .annotate(
+                search_rank=Cast(SearchRank(F("search_vector"), query), FloatField())
+            )
+        )
+
+
 class Recipe(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
@@ -60,13 +95,50 @@ class Recipe(models.Model):
     ingredients = models.ManyToManyField("Ingredient")
     image = models.ImageField(null=True, upload_to=recipe_image_file_path)
 
+    objects = RecipeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "-id"], name="recipe_user_id_desc_idx")]
+
     def __str__(self):
         return self.title
 
 
+class RecipeAttrQuerySet(models.QuerySet):
+    def add_recipe_counts(self, counts):
+        """Add `counts[pk]` (negative to subtract) to each `recipe_count`."""
+        pks_by_delta = defaultdict(list)
+        for pk, delta in counts.items():
+            if delta:
+                pks_by_delta[delta].append(pk)
+        for delta, pks in pks_by_delta.items():
+            self.filter(pk__in=pks).update(recipe_count=F("recipe_count") + delta)
+
+
 class Tag(models.Model):
     name = models.CharField(max_length=255)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Number of recipes linked to the tag, maintained by core.signals.
+    recipe_count = models.PositiveIntegerField(default=0)
+
+    objects = RecipeAttrQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "name"], name="unique_tag_name_per_user"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-name"],
+                name="tag_assigned_idx",
+                condition=models.Q(recipe_count__gt=0),
+            ),
+            models.Index(
+                fields=["user", "-recipe_count", "-name"], name="tag_popular_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -75,6 +147,44 @@ class Tag(models.Model):
 class Ingredient(models.Model):
     name = models.CharField(max_length=255)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Number of recipes linked to the ingredient, maintained by core.signals.
+    recipe_count = models.PositiveIntegerField(default=0)
+
+    objects = RecipeAttrQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "name"], name="unique_ingredient_name_per_user"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-name"],
+                name="ingredient_assigned_idx",
+                condition=models.Q(recipe_count__gt=0),
+            ),
+            models.Index(
+                fields=["user", "-recipe_count", "-name"],
+                name="ingredient_popular_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class ChangeVersion(models.Model):
+    """Counter bumped whenever a user's API-visible data changes."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+
+class ImageBlob(models.Model):
+    """A content-addressed recipe image file and how many recipes use it."""
+
+    name = models.CharField(max_length=255, primary_key=True)
+    ref_count = models.PositiveIntegerField(default=0)
@@ -0,0 +1,40 @@
+import codecs
+
+from core.renderers import MessagePackRenderer, msgpack, orjson
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+
+class FastJSONParser(parsers.JSONParser):
+    """`JSONParser` decoding with orjson when installed."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read()
+            if codecs.lookup(encoding).name != "utf-8":
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
+
+
+class MessagePackParser(parsers.BaseParser):
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (
+            ValueError,
+            TypeError,
+            msgpack.ExtraData,
+            msgpack.StackError,
+        ) as exc:
+            raise ParseError("MessagePack parse error - %s" % str(exc))
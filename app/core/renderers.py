@@ -0,0 +1,99 @@
+import decimal
+import math
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+# Hand datetimes to DRF's encoder, which formats them differently from
+# orjson, and accept non-str keys like json.dumps() does.
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+)
+
+
+def has_non_finite(data):
+    """Whether `data` holds a NaN or infinite float or Decimal."""
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+        elif isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, decimal.Decimal):
+            if not value.is_finite():
+                return True
+    return False
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    `JSONRenderer` encoding with orjson when installed.
+
+    Output matches the stdlib path except for the spelling of floats, which
+    orjson writes in their shortest form (`1e16` instead of `1e+16`) but
+    which decode to the same values. NaN and infinities, pretty-printed or
+    non-default (ASCII, non-compact) output still go through the stdlib path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        try:
+            ret = orjson.dumps(data, default=encoder.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            # E.g. integers beyond 64 bits, which only the stdlib handles.
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson writes NaN and infinities as null, where the stdlib raises
+        # (or writes them as is with STRICT_JSON off).
+        if b"null" in ret and has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same JavaScript-safe escaping as JSONRenderer.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class MessagePackEncoder(encoders.JSONEncoder):
+    def default(self, obj):
+        # Keep the exact value, as DecimalField does, instead of a float.
+        if isinstance(obj, decimal.Decimal):
+            return str(obj)
+        return super().default(obj)
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """Compact binary alternative to JSON, selected via `Accept`."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(
+            data, default=MessagePackEncoder().default, use_bin_type=True
+        )
@@ -0,0 +1,78 @@
+from collections import Counter
+
+from core.etags import bump_change_version
+from core.models import ChangeVersion, Ingredient, Recipe, Tag
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+RECIPE_ATTR_FIELDS = {
+    Recipe.tags.through: Recipe.tags.field,
+    Recipe.ingredients.through: Recipe.ingredients.field,
+}
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Ingredient)
+def bump_owner_version(sender, instance, **kwargs):
+    bump_change_version(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def bump_owner_version_on_m2m_change(sender, instance, action, **kwargs):
+    if action.startswith("post_"):
+        bump_change_version(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def bump_user_version(sender, instance, created, **kwargs):
+    if created:
+        ChangeVersion.objects.create(user=instance)
+    else:
+        bump_change_version(instance.pk)
+
+
+def _linked_attr_ids(through, field, instance, reverse, pk_set=None):
+    """Counter of attr id -> existing links touched by an m2m change."""
+    recipe_column = field.m2m_field_name()
+    attr_column = field.m2m_reverse_field_name()
+    own_column, other_column = (
+        (attr_column, recipe_column) if reverse else (recipe_column, attr_column)
+    )
+    links = through.objects.filter(**{own_column: instance.pk})
+    if pk_set is not None:
+        links = links.filter(**{f"{other_column}__in": pk_set})
+    return Counter(links.values_list(f"{attr_column}_id", flat=True))
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def update_recipe_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    field = RECIPE_ATTR_FIELDS[sender]
+    attr_model = field.related_model
+    if action == "post_add":
+        # Django has already dropped pk_set entries that were linked before.
+        counts = Counter({instance.pk: len(pk_set)} if reverse else pk_set)
+        attr_model.objects.add_recipe_counts(counts)
+    elif action in ("pre_remove", "pre_clear"):
+        # pk_set may name unlinked objects, so count the links going away.
+        pending = instance.__dict__.setdefault("_removed_recipe_links", {})
+        pending[sender] = _linked_attr_ids(sender, field, instance, reverse, pk_set)
+    elif action in ("post_remove", "post_clear"):
+        counts = instance.__dict__["_removed_recipe_links"].pop(sender)
+        attr_model.objects.add_recipe_counts({pk: -n for pk, n in counts.items()})
+
+
+@receiver(pre_delete, sender=Recipe)
+def update_recipe_counts_on_delete(sender, instance, **kwargs):
+    # The link rows are cascade-deleted without m2m_changed.
+    for through, field in RECIPE_ATTR_FIELDS.items():
+        counts = _linked_attr_ids(through, field, instance, reverse=False)
+        field.related_model.objects.add_recipe_counts(
+            {pk: -n for pk, n in counts.items()}
+        )
@@ -1,12 +1,30 @@
 """
 Test custom Django management commands.
 """
+import os
+import tempfile
+import time
+from io import StringIO
 from unittest.mock import patch
 
-from django.core.management import call_command
+from core.models import (
+    ChangeVersion,
+    ImageBlob,
+    Ingredient,
+    Recipe,
+    Tag,
+    recipe_image_variant_path,
+)
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 from psycopg2 import OperationalError as Psycopg2Error
+from utils.factories import recipe_factory, user_factory
 
 
 @patch("core.management.commands.wait_for_db.Command.check")
@@ -32,3 +50,151 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=["default"])
+
+
+class SeedDataCommandTests(TestCase):
+    def seed(self, **options):
+        options = {
+            "users": 3,
+            "recipes_per_user": 10,
+            "tags": 5,
+            "ingredients": 8,
+            "batch_size": 15,
+            **options,
+        }
+        call_command("seed_data", stdout=StringIO(), **options)
+
+    def test__seed_data__creates_linked_rows(self):
+        for method in ("copy", "bulk"):
+            with self.subTest(method=method):
+                self.seed(method=method, email_prefix=f"{method}-")
+
+                users = get_user_model().objects.filter(email__startswith=method)
+                self.assertEqual(users.count(), 3)
+                self.assertTrue(users[0].check_password("seedpass123"))
+                self.assertEqual(
+                    ChangeVersion.objects.filter(user__in=users).count(), 3
+                )
+                recipes = Recipe.objects.filter(user__in=users)
+                self.assertEqual(recipes.count(), 30)
+                self.assertTrue(recipes.filter(tags__isnull=False).exists())
+                for model in (Tag, Ingredient):
+                    attrs = model.objects.filter(user__in=users)
+                    self.assertFalse(
+                        attrs.annotate(linked=Count("recipe"))
+                        .exclude(recipe_count=F("linked"))
+                        .exists()
+                    )
+
+    def test__seed_data__is_reproducible(self):
+        self.seed(email_prefix="first-", seed=7)
+        self.seed(email_prefix="second-", seed=7, batch_size=100, method="bulk")
+
+        def contents(prefix):
+            return list(
+                Recipe.objects.filter(user__email__startswith=prefix)
+                .order_by("id")
+                .values_list("title", "description", "price")
+            )
+
+        self.assertEqual(contents("first-"), contents("second-"))
+
+    def test__seed_data__existing_users__raise_error(self):
+        self.seed()
+
+        with self.assertRaises(CommandError):
+            self.seed()
+
+
+class DeleteOrphanedMediaCommandTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media_root.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.recipe = recipe_factory(user=user_factory())
+
+    def write_files(self, name, age_hours=48):
+        """Write the image `name` and its variants, `age_hours` old."""
+        paths = [default_storage.path(name)] + [
+            default_storage.path(recipe_image_variant_path(name, variant))
+            for variant in settings.RECIPE_IMAGE_VARIANTS
+        ]
+        mtime = time.time() - age_hours * 3600
+        for path in paths:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"data")
+            os.utime(path, (mtime, mtime))
+        return paths
+
+    def test__delete_orphaned_media__keeps_referenced_files(self):
+        self.recipe.image.save("kept.jpg", ContentFile(b"kept"))
+        kept = self.write_files(self.recipe.image.name)
+        orphan = "uploads/recipe/orphan.jpg"
+        orphans = self.write_files(orphan) + [
+            default_storage.path("uploads/recipe/variants/kept_huge_1x1.jpg"),
+            default_storage.path("uploads/recipe/.abandoned.part"),
+        ]
+        for path in orphans[-2:]:
+            with open(path, "wb") as f:
+                f.write(b"data")
+            os.utime(path, (0, 0))
+        recent = self.write_files("uploads/recipe/in-flight.jpg", age_hours=0)[0]
+
+        call_command("delete_orphaned_media", dry_run=True, stdout=StringIO())
+        self.assertTrue(all(os.path.exists(path) for path in orphans))
+
+        call_command("delete_orphaned_media", stdout=StringIO())
+
+        for path in kept + [recent]:
+            self.assertTrue(os.path.exists(path), path)
+        for path in orphans:
+            self.assertFalse(os.path.exists(path), path)
+
+    def test__delete_orphaned_media__deletes_unreferenced_blob(self):
+        orphan = "uploads/recipe/orphan.jpg"
+        paths = self.write_files(orphan)
+        ImageBlob.objects.create(name=orphan, ref_count=1)
+
+        call_command("delete_orphaned_media", dry_run=True, stdout=StringIO())
+        self.assertTrue(ImageBlob.objects.filter(name=orphan).exists())
+
+        call_command("delete_orphaned_media", stdout=StringIO())
+
+        self.assertFalse(ImageBlob.objects.filter(name=orphan).exists())
+        for path in paths:
+            self.assertFalse(os.path.exists(path), path)
+
+    @patch(
+        "core.management.commands.delete_orphaned_media.Command._referenced_names",
+        return_value=iter(()),
+    )
+    def test__delete_orphaned_media__keeps_blob_attached_during_scan(self, _):
+        name = "uploads/recipe/attached.jpg"
+        paths = self.write_files(name)
+        ImageBlob.objects.create(name=name, ref_count=0)
+        Recipe.objects.filter(id=self.recipe.id).update(image=name)
+
+        call_command("delete_orphaned_media", stdout=StringIO())
+
+        self.assertEqual(ImageBlob.objects.get(name=name).ref_count, 1)
+        for path in paths:
+            self.assertTrue(os.path.exists(path), path)
+
+    def test__delete_orphaned_media__drops_zero_count_blobs(self):
+        ImageBlob.objects.create(name="uploads/recipe/released.jpg", ref_count=0)
+        ImageBlob.objects.create(name="uploads/recipe/used.jpg", ref_count=0)
+        Recipe.objects.filter(id=self.recipe.id).update(image="uploads/recipe/used.jpg")
+        recipe_factory(user=self.recipe.user)  # Without an image.
+
+        call_command("delete_orphaned_media", dry_run=True, stdout=StringIO())
+        self.assertEqual(ImageBlob.objects.count(), 2)
+
+        call_command("delete_orphaned_media", stdout=StringIO())
+
+        self.assertQuerysetEqual(
+            ImageBlob.objects.values_list("name", flat=True),
+            ["uploads/recipe/used.jpg"],
+        )
@@ -0,0 +1,99 @@
+import gzip
+import json
+from unittest import skipUnless
+
+from core import compression
+from core.middleware import CompressionMiddleware
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+PAYLOAD = {"results": [{"title": f"Recipe {i}", "tags": []} for i in range(200)]}
+
+
+class SelectEncodingTests(SimpleTestCase):
+    def test__gzip_only__selects_gzip(self):
+        self.assertEqual(compression.select_encoding("gzip, deflate"), "gzip")
+
+    def test__q_values__rank_encodings(self):
+        self.assertEqual(compression.select_encoding("br;q=0.5, gzip"), "gzip")
+
+    def test__rejected_encodings__select_none(self):
+        self.assertIsNone(compression.select_encoding(""))
+        self.assertIsNone(compression.select_encoding("gzip;q=0"))
+        self.assertIsNone(compression.select_encoding("*;q=0"))
+
+    def test__wildcard__selects_preferred_encoding(self):
+        self.assertEqual(
+            compression.select_encoding("*"), next(iter(compression.COMPRESSORS))
+        )
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, accept_encoding="gzip"):
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test__large_json__is_compressed(self):
+        response = self.process(JsonResponse(PAYLOAD))
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(json.loads(gzip.decompress(response.content)), PAYLOAD)
+
+    def test__small_response__is_not_compressed(self):
+        response = self.process(JsonResponse({"id": 1}))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    @override_settings(
+        RESPONSE_COMPRESSION={
+            "MIN_SIZE": 0,
+            "LEVELS": {"gzip": 6},
+            "CONTENT_TYPES": ["application/json"],
+        }
+    )
+    def test__html__is_not_compressed(self):
+        response = self.process(HttpResponse("<p>" * 1000))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test__strong_etag__is_weakened(self):
+        response = JsonResponse(PAYLOAD)
+        response["ETag"] = '"abc"'
+
+        self.assertEqual(self.process(response)["ETag"], 'W/"abc"')
+
+    def test__streaming_response__is_compressed_per_chunk(self):
+        chunks = [json.dumps(item).encode() + b"\n" for item in PAYLOAD["results"]]
+        response = self.process(
+            StreamingHttpResponse(iter(chunks), content_type="application/json")
+        )
+
+        compressed = list(response.streaming_content)
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(compressed), len(chunks) + 1)
+        self.assertEqual(gzip.decompress(b"".join(compressed)), b"".join(chunks))
+
+    @skipUnless("br" in compression.COMPRESSORS, "brotli is not installed.")
+    def test__brotli__round_trips(self):
+        import brotli
+
+        response = self.process(JsonResponse(PAYLOAD), accept_encoding="br, gzip")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(json.loads(brotli.decompress(response.content)), PAYLOAD)
+
+    @skipUnless("zstd" in compression.COMPRESSORS, "zstandard is not installed.")
+    def test__zstd__round_trips(self):
+        import zstandard
+
+        response = self.process(JsonResponse(PAYLOAD), accept_encoding="zstd")
+
+        self.assertEqual(response["Content-Encoding"], "zstd")
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(response.content)
+        self.assertEqual(json.loads(data), PAYLOAD)
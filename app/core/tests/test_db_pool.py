@@ -0,0 +1,91 @@
+import copy
+import threading
+
+from core.db.backends.postgresql.base import DatabaseWrapper
+from core.db.pool import ConnectionPool, PoolTimeout, close_pools
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+
+class FakeConnection:
+    closed = 0
+
+    def close(self):
+        self.closed = 1
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test__released_connection__is_reused(self):
+        pool = ConnectionPool(max_size=2, timeout=1)
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+
+        self.assertIs(pool.acquire(FakeConnection), first)
+        self.assertEqual(len(pool), 1)
+
+    def test__exhausted_pool__times_out(self):
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        pool.acquire(FakeConnection)
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(FakeConnection)
+
+    def test__exhausted_pool__waits_for_release(self):
+        pool = ConnectionPool(max_size=1, timeout=5)
+        first = pool.acquire(FakeConnection)
+        threading.Timer(0.05, pool.release, [first]).start()
+
+        self.assertIs(pool.acquire(FakeConnection), first)
+
+    def test__failed_check__discards_connection(self):
+        pool = ConnectionPool(max_size=1, timeout=1)
+        stale = pool.acquire(FakeConnection)
+        pool.release(stale)
+
+        fresh = pool.acquire(FakeConnection, check=lambda conn: False)
+
+        self.assertIsNot(fresh, stale)
+        self.assertTrue(stale.closed)
+        self.assertEqual(len(pool), 1)
+
+    def test__failed_connect__frees_slot(self):
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+
+        with self.assertRaises(RuntimeError):
+            pool.acquire(lambda: (_ for _ in ()).throw(RuntimeError))
+
+        self.assertEqual(len(pool), 0)
+
+
+class PooledBackendTests(TestCase):
+    def make_wrapper(self, **settings):
+        settings_dict = copy.deepcopy(connection.settings_dict)
+        settings_dict.update(settings)
+        return DatabaseWrapper(settings_dict, alias="pool-test")
+
+    def tearDown(self):
+        close_pools()
+
+    def test__close__returns_connection_to_pool(self):
+        wrapper = self.make_wrapper(POOL_MAX_SIZE=1)
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+
+        wrapper.ensure_connection()
+
+        self.assertIs(wrapper.connection, raw)
+        wrapper.close()
+
+    def test__health_check__replaces_broken_connection(self):
+        wrapper = self.make_wrapper(CONN_HEALTH_CHECKS=True)
+        wrapper.ensure_connection()
+        broken = wrapper.connection
+        broken.close()
+        wrapper.close_if_unusable_or_obsolete()
+
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+        self.assertIsNot(wrapper.connection, broken)
+        wrapper.close()
@@ -0,0 +1,89 @@
+from core.models import Ingredient, Recipe, Tag
+from django.db import connection
+from django.test import TestCase
+from recipe.views import RecipeViewSet
+from utils.factories import (
+    ingredient_factory,
+    recipe_factory,
+    tag_factory,
+    user_factory,
+)
+
+
+class IndexUsageTests(TestCase):
+    """Check via EXPLAIN that hot API querysets are served by an index."""
+
+    def setUp(self):
+        self.user = user_factory()
+        recipe = recipe_factory(user=self.user)
+        recipe.tags.add(tag_factory(user=self.user, name="Vegan"))
+        recipe.ingredients.add(ingredient_factory(user=self.user, name="Kale"))
+        # Tiny test tables would otherwise always be sequentially scanned.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, index_name=None):
+        plan = queryset.explain()
+
+        self.assertNotIn("Seq Scan", plan)
+        if index_name:
+            self.assertIn(f"using {index_name}", plan)
+            self.assertNotIn("Sort", plan)
+
+    def test__recipes_for_user__use_user_id_index(self):
+        queryset = Recipe.objects.filter(user=self.user).order_by("-id")
+
+        self.assertUsesIndex(queryset, "recipe_user_id_desc_idx")
+
+    def test__tags_for_user__use_user_name_index(self):
+        queryset = Tag.objects.filter(user=self.user).order_by("-name")
+
+        self.assertUsesIndex(queryset, "unique_tag_name_per_user")
+
+    def test__ingredients_for_user__use_user_name_index(self):
+        queryset = Ingredient.objects.filter(user=self.user).order_by("-name")
+
+        self.assertUsesIndex(queryset, "unique_ingredient_name_per_user")
+
+    def assertAttrFilterUsesIndex(self, field_name, index_name):
+        """Check both match modes of the recipe list's tag/ingredient filter."""
+        attr_model = Recipe._meta.get_field(field_name).related_model
+        attr_ids = list(attr_model.objects.values_list("id", flat=True))
+        recipes = Recipe.objects.filter(user=self.user)
+        for match in ("any", "all"):
+            with self.subTest(match=match):
+                queryset = RecipeViewSet()._filter_by_attrs(
+                    recipes, field_name, attr_ids, match
+                )
+                plan = queryset.explain()
+
+                self.assertNotIn("Seq Scan", plan)
+                # The (recipe_id, attr_id) unique index would not do here.
+                self.assertRegex(plan, rf"(using|Index Scan on) {index_name}\b")
+
+    def test__recipes_filtered_by_tags__use_reverse_link_index(self):
+        self.assertAttrFilterUsesIndex("tags", "core_recipe_tags_tag_recipe_idx")
+
+    def test__recipes_filtered_by_ingredients__use_reverse_link_index(self):
+        self.assertAttrFilterUsesIndex(
+            "ingredients", "core_recipe_ingredients_ingredient_recipe_idx"
+        )
+
+    def test__recipe_search__uses_search_vector_index(self):
+        queryset = Recipe.objects.search("example")
+
+        self.assertIn("core_recipe_search_vector_idx", queryset.explain())
+
+    def test__assigned_tags__use_partial_index(self):
+        queryset = Tag.objects.filter(user=self.user, recipe_count__gt=0).order_by(
+            "-name"
+        )
+
+        self.assertUsesIndex(queryset, "tag_assigned_idx")
+
+    def test__popular_ingredients__use_popular_index(self):
+        queryset = Ingredient.objects.filter(user=self.user).order_by(
+            "-recipe_count", "-name"
+        )
+
+        self.assertUsesIndex(queryset, "ingredient_popular_idx")
@@ -0,0 +1,98 @@
+"""
+Test the load_test management command.
+"""
+import json
+import os
+import tempfile
+import time
+from collections import Counter, defaultdict
+from io import StringIO
+
+from core.management.commands.load_test import Worker
+from core.throttling import bucket_store
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, SimpleTestCase, override_settings
+
+
+@override_settings(
+    REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+)
+class LoadTestCommandTests(LiveServerTestCase):
+    def setUp(self):
+        bucket_store.clear()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media_root.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.output = os.path.join(media_root.name, "report.json")
+
+    def test__load_test__reports_every_operation(self):
+        stdout = StringIO()
+
+        call_command(
+            "load_test",
+            url=self.live_server_url,
+            concurrency=2,
+            # --requests alone runs without a deadline, so all 300 are sent.
+            requests=150,
+            output=self.output,
+            stdout=stdout,
+        )
+
+        with open(self.output) as f:
+            report = json.load(f)["operations"]
+        self.assertEqual(sum(row["requests"] for row in report.values()), 300)
+        self.assertIn("recipe-list", report)
+        self.assertIn("recipe-create", report)
+        for name, row in report.items():
+            with self.subTest(operation=name):
+                self.assertLessEqual(row["p50_ms"], row["p99_ms"])
+                self.assertEqual(
+                    [status for status in row["statuses"] if status[0] != "2"], []
+                )
+        self.assertIn("total", stdout.getvalue())
+
+    @override_settings(
+        RESPONSE_COMPRESSION={**settings.RESPONSE_COMPRESSION, "MIN_SIZE": 0}
+    )
+    def test__load_test__reads_compressed_responses(self):
+        call_command(
+            "load_test",
+            url=self.live_server_url,
+            concurrency=1,
+            requests=50,
+            compress=True,
+            output=self.output,
+            stdout=StringIO(),
+        )
+
+        with open(self.output) as f:
+            report = json.load(f)["operations"]
+        self.assertEqual(sum(row["requests"] for row in report.values()), 50)
+        for name, row in report.items():
+            with self.subTest(operation=name):
+                self.assertEqual(
+                    [status for status in row["statuses"] if status[0] != "2"], []
+                )
+
+
+class LoadTestTests(SimpleTestCase):
+    def test__unknown_operation__raises_error(self):
+        with self.assertRaisesMessage(CommandError, "Unknown operation 'nope'"):
+            call_command("load_test", mix="nope=1")
+
+    def test__worker__counts_and_backs_off_on_skipped_operations(self):
+        options = {"compress": False, "seed": 0, "timeout": 1}
+        worker = Worker(0, "http://localhost:1", "a@example.com", "pass", options)
+        results, skipped = defaultdict(list), Counter()
+
+        # Nothing of its own to delete, so every pick is skipped.
+        worker.run(
+            {"tag-destroy": 1}, time.monotonic() + 0.2, float("inf"), results, skipped
+        )
+
+        self.assertEqual(results, {})
+        self.assertGreater(skipped["tag-destroy"], 0)
+        self.assertLess(skipped["tag-destroy"], 50)
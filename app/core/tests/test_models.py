@@ -3,11 +3,14 @@ from unittest.mock import patch
 
 from core import models
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 from django.test import TestCase
 from utils.factories import (
     EXAMPLE_EMAIL,
     EXAMPLE_PASSWORD,
     ingredient_factory,
+    recipe_factory,
+    tag_factory,
     user_factory,
 )
 
@@ -68,6 +71,13 @@ class ModelTests(TestCase):
 
         self.assertEqual(str(tag), tag.name)
 
+    def test__create_tag__duplicated_name_for_user__raises_error(self):
+        user = user_factory()
+        models.Tag.objects.create(user=user, name="Tag1")
+
+        with self.assertRaises(IntegrityError):
+            models.Tag.objects.create(user=user, name="Tag1")
+
     def test__create_ingredient_successful(self):
         user = user_factory()
 
@@ -82,3 +92,58 @@ class ModelTests(TestCase):
         file_path = models.recipe_image_file_path(None, "example.jpg")
 
         self.assertEqual(file_path, f"uploads/recipe/{uuid}.jpg")
+
+
+class RecipeCountTests(TestCase):
+    def setUp(self):
+        self.user = user_factory()
+        self.recipe = recipe_factory(user=self.user)
+        self.tag = tag_factory(user=self.user, name="Vegan")
+        self.other_tag = tag_factory(user=self.user, name="Quick")
+
+    def assertCounts(self, tag_count, other_tag_count):
+        self.tag.refresh_from_db()
+        self.other_tag.refresh_from_db()
+        self.assertEqual(
+            (self.tag.recipe_count, self.other_tag.recipe_count),
+            (tag_count, other_tag_count),
+        )
+
+    def test__m2m_changes__maintain_recipe_count(self):
+        self.recipe.tags.add(self.tag, self.other_tag)
+        self.recipe.tags.add(self.tag)
+        self.assertCounts(1, 1)
+
+        self.recipe.tags.remove(self.tag)
+        self.recipe.tags.remove(self.tag)
+        self.assertCounts(0, 1)
+
+        self.recipe.tags.set([self.tag])
+        self.assertCounts(1, 0)
+
+        self.recipe.tags.clear()
+        self.assertCounts(0, 0)
+
+    def test__reverse_m2m_changes__maintain_recipe_count(self):
+        other_recipe = recipe_factory(user=self.user)
+
+        self.tag.recipe_set.add(self.recipe, other_recipe)
+        self.assertCounts(2, 0)
+
+        self.tag.recipe_set.remove(self.recipe)
+        self.assertCounts(1, 0)
+
+        self.tag.recipe_set.clear()
+        self.assertCounts(0, 0)
+
+    def test__delete_recipe__decrements_recipe_count(self):
+        ingredient = ingredient_factory(user=self.user, name="Salt")
+        self.recipe.tags.add(self.tag)
+        self.recipe.ingredients.add(ingredient)
+        recipe_factory(user=self.user).tags.add(self.tag)
+
+        models.Recipe.objects.filter(id=self.recipe.id).delete()
+
+        ingredient.refresh_from_db()
+        self.assertCounts(1, 0)
+        self.assertEqual(ingredient.recipe_count, 0)
@@ -0,0 +1,145 @@
+import datetime
+import io
+import json
+from collections import OrderedDict
+from decimal import Decimal
+from unittest import skipIf
+
+from core.parsers import FastJSONParser, MessagePackParser
+from core.renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from utils.factories import recipe_factory, tag_factory, user_factory
+
+RECIPES_URL = reverse("recipe:recipe-list")
+
+PAYLOAD = OrderedDict(
+    [
+        ("id", 1),
+        ("title", 'Crème brûlée \u2028 \u2029 "quoted"'),
+        ("price", "5.50"),
+        ("raw_price", Decimal("0.10")),
+        ("ratio", 0.1),
+        ("created", datetime.datetime(2024, 1, 2, 3, 4, 5, 678901)),
+        ("aware", datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc)),
+        ("day", datetime.date(2024, 1, 2)),
+        ("lazy", gettext_lazy("This field is required.")),
+        ("tags", [{"id": 2, "name": "Vegan"}, {"id": 3, "name": None}]),
+        (7, True),
+    ]
+)
+
+
+class FastJSONTests(SimpleTestCase):
+    def test__render__matches_stdlib_renderer_bytes(self):
+        for accepted in (None, "application/json", "application/json; indent=4"):
+            with self.subTest(accepted=accepted):
+                self.assertEqual(
+                    FastJSONRenderer().render(PAYLOAD, accepted),
+                    JSONRenderer().render(PAYLOAD, accepted),
+                )
+
+    def test__render__falls_back_for_big_integers(self):
+        self.assertEqual(
+            FastJSONRenderer().render({"n": 2**70}), b'{"n":%d}' % 2**70
+        )
+
+    def test__render__floats_decode_to_stdlib_values(self):
+        data = {"values": [1e16, 1e-7, 0.1, -2.5e300, 3.0]}
+
+        body = FastJSONRenderer().render(data)
+
+        self.assertEqual(json.loads(body), json.loads(JSONRenderer().render(data)))
+
+    def test__render__non_finite_numbers_match_stdlib_renderer(self):
+        for value in (float("nan"), float("inf"), -float("inf"), Decimal("NaN")):
+            data = {"values": [{"id": None, "ratio": value}]}
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render(data)
+
+                lenient, stdlib = FastJSONRenderer(), JSONRenderer()
+                lenient.strict = stdlib.strict = False
+                self.assertEqual(lenient.render(data), stdlib.render(data))
+
+    def test__parse__decodes_json(self):
+        body = '{"title": "Crème", "price": 5.5, "tags": []}'.encode()
+
+        data = FastJSONParser().parse(io.BytesIO(body))
+
+        self.assertEqual(data, {"title": "Crème", "price": 5.5, "tags": []})
+
+    def test__parse__invalid_json_raises_parse_error(self):
+        for body in (b"{not json", b'{"a": NaN}'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
+
+    @skipIf(orjson is None, "orjson is not installed.")
+    def test__parse__handles_non_utf8_charset(self):
+        body = '{"title": "Crème"}'.encode("latin-1")
+
+        data = FastJSONParser().parse(
+            io.BytesIO(body), parser_context={"encoding": "latin-1"}
+        )
+
+        self.assertEqual(data, {"title": "Crème"})
+
+
+@skipIf(msgpack is None, "msgpack is not installed.")
+class MessagePackTests(TestCase):
+    def setUp(self):
+        self.user = user_factory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test__render__keeps_decimals_exact(self):
+        body = MessagePackRenderer().render({"price": Decimal("5.50")})
+
+        self.assertEqual(MessagePackParser().parse(io.BytesIO(body)), {"price": "5.50"})
+
+    def test__list_recipes__negotiated_via_accept(self):
+        recipe = recipe_factory(user=self.user)
+        recipe.tags.add(tag_factory(user=self.user, name="Vegan"))
+
+        res = self.client.get(RECIPES_URL, HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/msgpack")
+        self.assertEqual(
+            msgpack.unpackb(res.content), self.client.get(RECIPES_URL).json()
+        )
+
+    def test__create_recipe__from_msgpack_body(self):
+        payload = {"title": "Toast", "time_minutes": 3, "price": "1.20"}
+
+        res = self.client.post(
+            RECIPES_URL,
+            msgpack.packb(payload),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(msgpack.unpackb(res.content)["price"], "1.20")
+
+    def test__parse__malformed_msgpack_raises_parse_error(self):
+        bodies = (
+            b"\xc1",  # Reserved type byte.
+            b"\xd9",  # Truncated string.
+            b"\x01\x02",  # Trailing data.
+            b"\x91" * 2000 + b"\x01",  # Nested too deep.
+            b"\x81\x90\x01",  # List as map key.
+        )
+        for body in bodies:
+            with self.subTest(body=body[:4]), self.assertRaises(ParseError):
+                MessagePackParser().parse(io.BytesIO(body))
+
+    def test__invalid_msgpack_body__returns_400(self):
+        res = self.client.post(RECIPES_URL, b"\xc1", content_type="application/msgpack")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,131 @@
+from unittest import skipUnless
+
+from core.checks import check_replica_sticky_cache
+from core.db.routers import PrimaryReplicaRouter, replica_reads
+from core.middleware import ReplicaRoutingMiddleware
+from core.models import Recipe
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from utils.factories import recipe_factory, user_factory
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test__reads_outside_requests__use_primary(self):
+        self.assertEqual(self.router.db_for_read(Recipe), "default")
+
+    def test__replica_reads__use_replica(self):
+        token = replica_reads.set(True)
+        self.addCleanup(replica_reads.reset, token)
+
+        self.assertEqual(self.router.db_for_read(Recipe), "replica_0")
+        self.assertEqual(self.router.db_for_write(Recipe), "default")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test__no_replicas__reads_use_primary(self):
+        token = replica_reads.set(True)
+        self.addCleanup(replica_reads.reset, token)
+
+        self.assertEqual(self.router.db_for_read(Recipe), "default")
+
+    def test__migrations__only_run_on_primary(self):
+        self.assertTrue(self.router.allow_migrate("default", "core"))
+        self.assertFalse(self.router.allow_migrate("replica_0", "core"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = ReplicaRoutingMiddleware(self.get_response)
+
+    def get_response(self, request):
+        self.used_replica = replica_reads.get()
+        return HttpResponse()
+
+    def request(self, method, token="Token abc"):
+        request = getattr(self.factory, method)("/", HTTP_AUTHORIZATION=token)
+        self.middleware(request)
+        return self.used_replica
+
+    def test__safe_request__allows_replica_reads(self):
+        self.assertTrue(self.request("get"))
+        self.assertFalse(replica_reads.get())
+
+    def test__write__pins_client_to_primary(self):
+        self.assertFalse(self.request("post"))
+
+        self.assertFalse(self.request("get"))
+        self.assertTrue(self.request("get", token="Token other"))
+
+    @override_settings(DATABASE_REPLICA_STICKY_SECONDS=0)
+    def test__sticky_window_expired__allows_replica_reads(self):
+        self.request("post")
+
+        self.assertTrue(self.request("get"))
+
+
+class ReplicaStickyCacheCheckTests(SimpleTestCase):
+    @override_settings(DATABASE_REPLICAS=["replica_0"])
+    def test__process_local_sticky_cache__warns(self):
+        messages = check_replica_sticky_cache(None)
+
+        self.assertEqual([message.id for message in messages], ["core.W001"])
+
+    @override_settings(
+        DATABASE_REPLICAS=["replica_0"],
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": "/tmp/replica-sticky-check",
+            }
+        },
+    )
+    def test__shared_sticky_cache__passes(self):
+        self.assertEqual(check_replica_sticky_cache(None), [])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test__no_replicas__passes(self):
+        self.assertEqual(check_replica_sticky_cache(None), [])
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "Set DB_REPLICA_HOSTS to run.")
+class ReplicaReadTests(TransactionTestCase):
+    """Run with a second alias, e.g. DB_REPLICA_HOSTS=$DB_HOST."""
+
+    databases = {"default", *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        self.user = user_factory()
+        self.client = APIClient()
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def test__list__reads_committed_data_from_replica(self):
+        recipe = recipe_factory(user=self.user)
+
+        replica = connections[settings.DATABASE_REPLICAS[0]]
+        with CaptureQueriesContext(replica) as queries:
+            res = self.client.get(reverse("recipe:recipe-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(queries.captured_queries)
+        self.assertEqual([r["id"] for r in res.data], [recipe.id])
@@ -0,0 +1,160 @@
+import threading
+import time
+
+from core.throttling import BucketStore, bucket_store, take_token
+from django.conf import settings
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from utils.factories import user_factory
+
+TOKEN_URL = reverse("user:token")
+ME_URL = reverse("user:me")
+RECIPES_URL = reverse("recipe:recipe-list")
+
+
+def throttle_rates(**rates):
+    return override_settings(
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+    )
+
+
+class SlowCache:
+    """Widens the window between reading and writing a bucket."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, key):
+        value = self.backend.get(key)
+        time.sleep(0.01)
+        return value
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+
+class BrokenCache:
+    def get(self, key):
+        raise ConnectionError
+
+    set = get
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test__full_bucket__allows_burst_then_waits(self):
+        state = None
+        for _ in range(3):
+            state, wait = take_token(state, capacity=3, rate=1, now=100)
+            self.assertEqual(wait, 0)
+
+        self.assertEqual(take_token(state, capacity=3, rate=1, now=100), (None, 1))
+
+    def test__bucket__refills_at_rate(self):
+        state = (0, 100)
+
+        self.assertEqual(take_token(state, capacity=3, rate=2, now=100.25)[1], 0.25)
+        self.assertEqual(take_token(state, capacity=3, rate=2, now=101), ((1, 101), 0))
+
+    def test__shared_cache_failure__falls_back_to_local_buckets(self):
+        store = BucketStore(max_size=10, backend=BrokenCache())
+
+        with self.assertLogs("core.throttling", "WARNING"):
+            self.assertEqual(store.consume("key", capacity=1, rate=0.1), 0)
+            self.assertGreater(store.consume("key", capacity=1, rate=0.1), 0)
+
+    def test__concurrent_consumers__share_one_bucket(self):
+        cache = caches["default"]
+        cache.clear()
+        store = BucketStore(max_size=10, backend=SlowCache(cache))
+        barrier = threading.Barrier(8)
+        waits = []
+
+        def consume():
+            barrier.wait()
+            waits.append(store.consume("key", capacity=3, rate=0.001))
+
+        threads = [threading.Thread(target=consume) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(waits.count(0), 3)
+
+    def test__clear__keeps_other_shared_cache_entries(self):
+        cache = caches["default"]
+        cache.set("unrelated", 1)
+        store = BucketStore(max_size=10, backend=cache)
+        store.consume("key", capacity=1, rate=0.1)
+
+        store.clear()
+
+        self.assertEqual(cache.get("unrelated"), 1)
+        self.assertEqual(len(store.local), 0)
+
+    def test__shared_cache__holds_buckets(self):
+        cache = caches["default"]
+        cache.clear()
+        store = BucketStore(max_size=10, backend=cache)
+
+        store.consume("key", capacity=1, rate=0.1)
+
+        self.assertIsNotNone(cache.get("throttle:key"))
+        self.assertEqual(len(store.local), 0)
+
+
+class ThrottledApiTests(TestCase):
+    def setUp(self):
+        bucket_store.clear()
+        self.client = APIClient()
+
+    def authenticate(self, user):
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    @throttle_rates(token="2/min")
+    def test__token_issuance__is_throttled_per_ip(self):
+        payload = {"email": "test@example.com", "password": "wrong"}
+        for _ in range(2):
+            res = self.client.post(TOKEN_URL, payload)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+
+        res = self.client.post(TOKEN_URL, payload, REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @throttle_rates(read="1/min", write="5/min")
+    def test__reads__are_throttled_per_user_and_scope(self):
+        self.authenticate(user_factory())
+        self.client.get(RECIPES_URL)
+
+        self.assertEqual(
+            self.client.get(RECIPES_URL).status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+        res = self.client.post(
+            RECIPES_URL, {"title": "Soup", "time_minutes": 10, "price": "2.00"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.authenticate(user_factory(email="other@example.com"))
+        self.assertEqual(self.client.get(RECIPES_URL).status_code, status.HTTP_200_OK)
+
+    @throttle_rates(read="10/min")
+    def test__throttling__adds_no_queries(self):
+        self.authenticate(user_factory())
+        self.client.get(ME_URL)
+
+        # Only the ETag change-version lookup.
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
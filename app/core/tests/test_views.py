@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+from core.views import IMMUTABLE_CACHE_CONTROL, serve_media
+from django.test import RequestFactory, SimpleTestCase
+
+DIGEST = "a" * 64
+
+
+class ServeMediaTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.factory = RequestFactory()
+        for name in [f"{DIGEST}.jpg", f"{DIGEST}_thumbnail_150x150.jpg", "x.jpg"]:
+            with open(os.path.join(self.media_root.name, name), "wb") as f:
+                f.write(b"image")
+
+    def tearDown(self):
+        self.media_root.cleanup()
+
+    def _serve(self, path):
+        request = self.factory.get(f"/static/media/{path}")
+        return serve_media(request, path, document_root=self.media_root.name)
+
+    def test__content_addressed_files__served_as_immutable(self):
+        for path in [f"{DIGEST}.jpg", f"{DIGEST}_thumbnail_150x150.jpg"]:
+            res = self._serve(path)
+
+            self.assertEqual(res["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+
+    def test__other_files__not_served_as_immutable(self):
+        res = self._serve("x.jpg")
+
+        self.assertNotIn("Cache-Control", res)
@@ -0,0 +1,141 @@
+"""
+Token-bucket request throttling.
+
+Buckets live in the CACHES alias named by `THROTTLE_CACHE["BACKEND"]` so that
+all processes share them, and in a per-process LRU when no alias is configured
+or the shared cache is unavailable.
+"""
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+from utils.cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+# The longest period DRF rates can express.
+MAX_DURATION = 24 * 60 * 60
+
+
+def take_token(state, capacity, rate, now):
+    """
+    Refill a `(tokens, updated_at)` bucket and take one token from it.
+
+    Returns the new state, or None and the seconds until a token is available.
+    """
+    tokens, updated_at = state if state is not None else (capacity, now)
+    tokens = min(capacity, tokens + max(now - updated_at, 0) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return None, (1 - tokens) / rate
+
+
+class BucketStore(TieredCache):
+    """
+    Token buckets keyed by scope and client.
+
+    Only one tier is used at a time: the shared one, or the local one while
+    none is configured or it fails. Updates to a shared bucket hold a per-key
+    lock taken with `cache.add()`, so concurrent requests in different
+    processes cannot spend the same token.
+    """
+
+    key_prefix = "throttle:"
+    # Expiry of a lock whose holder died; updates take milliseconds.
+    lock_timeout = 1
+    lock_attempts = 50
+    lock_retry_delay = 0.002
+
+    def __init__(self, max_size: int, backend=None):
+        super().__init__(max_size=max_size, ttl=MAX_DURATION, backend=backend)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        return cls.from_options(settings.THROTTLE_CACHE)
+
+    def consume(self, key, capacity, rate):
+        """Take a token; return 0 if one was available, else the seconds to wait."""
+        if self.backend is not None:
+            try:
+                return self._consume_shared(key, capacity, rate)
+            except Exception:
+                logger.warning(
+                    "Shared throttle cache failed, using local buckets.",
+                    exc_info=True,
+                )
+        with self._lock:
+            state, wait = take_token(self.local.get(key), capacity, rate, time.time())
+            if state is not None:
+                self.local.set(key, state)
+        return wait
+
+    def _consume_shared(self, key, capacity, rate):
+        key = self.shared_key(key)
+        lock_key = key + ":lock"
+        for _ in range(self.lock_attempts):
+            if self.backend.add(lock_key, 1, self.lock_timeout):
+                break
+            time.sleep(self.lock_retry_delay)
+        else:
+            # Too many concurrent requests for this bucket: reject rather
+            # than risk handing out tokens twice.
+            return 1 / rate
+
+        try:
+            state, wait = take_token(self.backend.get(key), capacity, rate, time.time())
+            if state is not None:
+                # An expired bucket would have refilled completely anyway.
+                self.backend.set(key, state, math.ceil(capacity / rate))
+        finally:
+            self.backend.delete(lock_key)
+        return wait
+
+
+bucket_store = BucketStore.from_settings()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Per-user token bucket, per client IP for anonymous requests.
+
+    Views choose a scope with `throttle_scope`; otherwise safe methods use
+    "read" and the rest "write". A rate of "N/period" allows bursts of N
+    requests and refills N tokens per period. Scopes without a rate in
+    `DEFAULT_THROTTLE_RATES` are not throttled.
+    """
+
+    def __init__(self):
+        # The rate depends on the view, see allow_request().
+        self.wait_time = None
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scope", None) or (
+            "read" if request.method in SAFE_METHODS else "write"
+        )
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.wait_time = bucket_store.consume(
+            self.get_cache_key(request, view),
+            capacity=self.num_requests,
+            rate=self.num_requests / self.duration,
+        )
+        return self.wait_time == 0
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        return f"{self.scope}:{ident}"
+
+    def wait(self):
+        return self.wait_time
@@ -0,0 +1,15 @@
+import re
+
+from django.views.static import serve
+
+# Content-addressed media (see core.models.recipe_image_content_path) never
+# changes under the same URL, so it can be cached forever.
+CONTENT_ADDRESSED_PATH = re.compile(r"(^|/)[0-9a-f]{64}(_[\w-]+)?\.\w+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def serve_media(request, path, document_root=None):
+    response = serve(request, path, document_root=document_root)
+    if response.status_code == 200 and CONTENT_ADDRESSED_PATH.search(path):
+        response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
@@ -0,0 +1,69 @@
+"""
+Async (ASGI) read endpoints for recipes, tags and ingredients.
+
+Django 4.0 has no async ORM, so queryset evaluation and rendering run in one
+hop to the shared sync thread, which is what the 4.1+ async ORM methods do
+internally. Everything else, including token authentication on cache hits,
+stays on the event loop.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed, JsonResponse
+from recipe import views
+from rest_framework import status
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+from user.authentication import CachedTokenAuthentication
+
+
+class ResolvedAuthentication(BaseAuthentication):
+    """Return the `(user, auth)` the async view already resolved."""
+
+    def authenticate(self, request):
+        return getattr(request._request, "resolved_credentials", None)
+
+    def authenticate_header(self, request):
+        return CachedTokenAuthentication.keyword
+
+
+def _render(sync_view, request, *args, **kwargs):
+    response = sync_view(request, *args, **kwargs)
+    response.render()
+    return response
+
+
+def async_read_view(viewset_class, actions):
+    """Async counterpart of `viewset_class.as_view(actions)` for reads."""
+    sync_view = viewset_class.as_view(
+        actions, authentication_classes=[ResolvedAuthentication]
+    )
+    authenticator = CachedTokenAuthentication()
+
+    async def view(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return HttpResponseNotAllowed(["GET", "HEAD"])
+
+        try:
+            credentials = await authenticator.aauthenticate(request)
+        except AuthenticationFailed as exc:
+            credentials, detail = None, exc.detail
+        else:
+            detail = NotAuthenticated.default_detail
+        if credentials is None:
+            response = JsonResponse(
+                {"detail": str(detail)}, status=status.HTTP_401_UNAUTHORIZED
+            )
+            response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+            return response
+
+        # Read by ResolvedAuthentication, so the sync view does not
+        # authenticate again.
+        request.resolved_credentials = credentials
+        return await sync_to_async(_render)(sync_view, request, *args, **kwargs)
+
+    return view
+
+
+recipe_list = async_read_view(views.RecipeViewSet, {"get": "list"})
+recipe_detail = async_read_view(views.RecipeViewSet, {"get": "retrieve"})
+tag_list = async_read_view(views.TagViewSet, {"get": "list"})
+ingredient_list = async_read_view(views.IngredientViewSet, {"get": "list"})
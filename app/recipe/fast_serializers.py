@@ -0,0 +1,143 @@
+"""
+Read-only list serializers that render `values()` rows directly.
+
+They produce the same output as the wrapped `ModelSerializer` with
+`many=True`, but skip model instantiation and DRF's per-row field
+machinery.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from recipe.serializers import RecipeSerializer
+from rest_framework import serializers
+
+# Fields whose to_representation() returns DB values of the right type as is.
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+)
+
+
+def _compile_field(name, field):
+    """Return `(output key, values() lookup, converter or None)`."""
+    if field.source == "*" or "." in field.source:
+        raise ImproperlyConfigured(
+            f"Field {name!r} is not a plain model column and cannot be read "
+            "from values() rows."
+        )
+    converter = None if type(field) in PASSTHROUGH_FIELDS else field.to_representation
+    return name, field.source, converter
+
+
+def _render(row, columns):
+    item = {}
+    for key, lookup, converter in columns:
+        value = row[lookup]
+        if converter is not None and value is not None:
+            value = converter(value)
+        item[key] = value
+    return item
+
+
+class ValuesListSerializer:
+    """
+    Stand-in for `serializer_class(rows, many=True)` reading `values()` rows.
+
+    Nested many-to-many serializers are loaded with one query each, ordered by
+    the related object's primary key like the viewsets' prefetches.
+    """
+
+    serializer_class = None
+    _compiled = None
+
+    def __init__(self, instance=None, many=True, context=None, fields=None):
+        self.instance = instance
+        self.context = context or {}
+        self.fields = fields
+
+    @classmethod
+    def compile(cls):
+        if cls.__dict__.get("_compiled") is None:
+            model = cls.serializer_class.Meta.model
+            columns, nested = [], []
+            for name, field in cls.serializer_class().fields.items():
+                if not isinstance(field, serializers.ListSerializer):
+                    columns.append(_compile_field(name, field))
+                    continue
+                # Nested columns are read through the m2m table.
+                m2m_field = model._meta.get_field(field.source)
+                prefix = m2m_field.m2m_reverse_field_name()
+                child_columns = [
+                    (key, f"{prefix}__{lookup}", converter)
+                    for key, lookup, converter in (
+                        _compile_field(child_name, child_field)
+                        for child_name, child_field in field.child.fields.items()
+                    )
+                ]
+                nested.append((name, m2m_field, child_columns))
+            cls._compiled = columns, nested
+        return cls._compiled
+
+    @classmethod
+    def compile_fields(cls, fields=None):
+        """Compiled columns and nested relations, limited to `fields`."""
+        columns, nested = cls.compile()
+        if fields is None:
+            return columns, nested
+        return (
+            [column for column in columns if column[0] in fields],
+            [relation for relation in nested if relation[0] in fields],
+        )
+
+    @classmethod
+    def values(cls, queryset, fields=None):
+        """Turn a model queryset into the `values()` rows this class reads."""
+        columns, _ = cls.compile_fields(fields)
+        lookups = dict.fromkeys(lookup for _, lookup, _ in columns)
+        # Cursor pagination reads the ordering columns, e.g. the search rank
+        # and the id, from the rows, even when they are not rendered.
+        lookups.update(dict.fromkeys(queryset.query.annotation_select))
+        lookups.update(
+            dict.fromkeys(
+                name.lstrip("-")
+                for name in queryset.query.order_by
+                if isinstance(name, str)
+            )
+        )
+        return queryset.values("pk", *lookups)
+
+    @property
+    def data(self):
+        columns, nested = self.compile_fields(self.fields)
+        rows = list(self.instance)
+        pks = [row["pk"] for row in rows]
+        related = {
+            name: self._load_related(field, child_columns, pks)
+            for name, field, child_columns in nested
+        }
+
+        items = []
+        for row in rows:
+            item = _render(row, columns)
+            for name, _, _ in nested:
+                item[name] = related[name].get(row["pk"], [])
+            items.append(item)
+        return items
+
+    def _load_related(self, field, columns, pks):
+        if not pks:
+            return {}
+        own_column = f"{field.m2m_field_name()}_id"
+        links = (
+            field.remote_field.through.objects.filter(**{f"{own_column}__in": pks})
+            .order_by(f"{field.m2m_reverse_field_name()}_id")
+            .values(own_column, *(lookup for _, lookup, _ in columns))
+        )
+
+        by_pk = {}
+        for link in links:
+            by_pk.setdefault(link[own_column], []).append(_render(link, columns))
+        return by_pk
+
+
+class RecipeValuesSerializer(ValuesListSerializer):
+    serializer_class = RecipeSerializer
@@ -0,0 +1,130 @@
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from core.models import ImageBlob, recipe_image_content_path, recipe_image_variant_path
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+from recipe.uploads import StreamedImage
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Process-wide pool used to resize uploads off the request thread."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.RECIPE_IMAGE_WORKERS,
+                thread_name_prefix="recipe-image",
+            )
+        return _executor
+
+
+def generate_variants(name, storage=default_storage, overwrite=True):
+    """
+    Write every configured resized variant of the image stored at `name`.
+
+    Images are shared between recipes, so concurrent calls may write the same
+    variant; each is written to a temporary file and moved into place.
+    """
+    with storage.open(name, "rb") as original:
+        image = Image.open(original)
+        image_format = image.format or "JPEG"
+        image = ImageOps.exif_transpose(image)
+
+    if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    for variant, size in settings.RECIPE_IMAGE_VARIANTS.items():
+        path = storage.path(recipe_image_variant_path(name, variant))
+        if not overwrite and os.path.exists(path):
+            continue
+
+        resized = image.copy()
+        resized.thumbnail(size, Image.Resampling.LANCZOS)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = os.path.join(os.path.dirname(path), f".{uuid.uuid4()}.part")
+        try:
+            resized.save(temporary_path, format=image_format)
+            if storage.file_permissions_mode is not None:
+                os.chmod(temporary_path, storage.file_permissions_mode)
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+
+def _generate_variants_logged(name):
+    try:
+        generate_variants(name, overwrite=False)
+    except Exception:
+        logger.exception("Could not generate variants for %s", name)
+
+
+def schedule_variants(name):
+    """Generate variants in the worker pool once the upload is committed."""
+    transaction.on_commit(
+        lambda: get_executor().submit(_generate_variants_logged, name)
+    )
+
+
+def delete_image_files(name, storage=default_storage):
+    storage.delete(name)
+    for variant in settings.RECIPE_IMAGE_VARIANTS:
+        storage.delete(recipe_image_variant_path(name, variant))
+
+
+def acquire_image(name):
+    """Add a reference to `name`, locking its row until the transaction ends."""
+    blob, _ = ImageBlob.objects.select_for_update().get_or_create(name=name)
+    blob.ref_count += 1
+    blob.save(update_fields=["ref_count"])
+
+
+def release_image(name):
+    """
+    Drop a reference to `name` and delete the files once nothing uses them.
+
+    Zero-count rows are kept so that the deletion can re-check the count under
+    the row lock after commit, instead of racing a concurrent `acquire_image`.
+    """
+    blob = ImageBlob.objects.select_for_update().filter(name=name).first()
+    if blob is None or blob.ref_count == 0:
+        return
+
+    blob.ref_count -= 1
+    blob.save(update_fields=["ref_count"])
+    if blob.ref_count == 0:
+        transaction.on_commit(lambda: _delete_if_unreferenced(name))
+
+
+def _delete_if_unreferenced(name):
+    with transaction.atomic():
+        blob = ImageBlob.objects.select_for_update().filter(name=name).first()
+        if blob is not None and blob.ref_count == 0:
+            delete_image_files(name)
+
+
+def attach_image(recipe, upload: StreamedImage, storage=default_storage):
+    """Store `upload` under its content hash and make it `recipe`'s image."""
+    name = recipe_image_content_path(upload.digest, upload.extension)
+    old_name = recipe.image.name
+    with transaction.atomic():
+        acquire_image(name)
+        # Identical bytes may already be there; replacing them is harmless and
+        # restores the file if it was just deleted for having no references.
+        os.replace(upload.temporary_file_path(), storage.path(name))
+        recipe.image.name = name
+        recipe.save(update_fields=["image"])
+        if old_name:
+            release_image(old_name)
@@ -0,0 +1,73 @@
+"""
+Django command to compare recipe list serialization throughput.
+"""
+import time
+
+from core.models import Ingredient, Recipe, Tag
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+from recipe.fast_serializers import RecipeValuesSerializer
+from recipe.serializers import RecipeSerializer
+from rest_framework.renderers import JSONRenderer
+from utils.factories import recipes_factory
+
+
+class Command(BaseCommand):
+    """
+    Time `GET /recipes/`-equivalent serialization through `RecipeSerializer`
+    and through `RecipeValuesSerializer`, on throwaway data that is rolled
+    back afterwards.
+    """
+
+    help = "Benchmark the values()-based recipe list serializer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+        parser.add_argument("--attrs-per-recipe", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'rows':>7} {'model rows/s':>13} {'values rows/s':>14} {'speedup':>8}"
+        )
+        for size in options["sizes"]:
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(
+                    email="list-benchmark@example.com"
+                )
+                recipes_factory(user, size, options["attrs_per_recipe"])
+                model_time, model_body = self._time(
+                    self._render_models, user, options["repeat"]
+                )
+                values_time, values_body = self._time(
+                    self._render_values, user, options["repeat"]
+                )
+                transaction.set_rollback(True)
+
+            if model_body != values_body:
+                self.stderr.write(f"Output differs at {size} rows!")
+            self.stdout.write(
+                f"{size:>7} {size / model_time:>13.0f} {size / values_time:>14.0f} "
+                f"{model_time / values_time:>7.1f}x"
+            )
+
+    def _time(self, render, user, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = render(Recipe.objects.filter(user=user).order_by("-id"))
+            best = min(best, time.perf_counter() - start)
+        return best, body
+
+    def _render_models(self, queryset):
+        queryset = queryset.prefetch_related(
+            Prefetch("tags", queryset=Tag.objects.order_by("id")),
+            Prefetch("ingredients", queryset=Ingredient.objects.order_by("id")),
+        )
+        return JSONRenderer().render(RecipeSerializer(queryset, many=True).data)
+
+    def _render_values(self, queryset):
+        rows = RecipeValuesSerializer.values(queryset)
+        return JSONRenderer().render(RecipeValuesSerializer(rows, many=True).data)
@@ -0,0 +1,26 @@
+from rest_framework.pagination import CursorPagination
+
+
+class RecipeCursorPagination(CursorPagination):
+    """
+    Keyset pagination that clients opt into by passing `page_size`.
+
+    Without `page_size` the full list is returned, as before pagination existed.
+    """
+
+    page_size = None
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
+
+    def get_ordering(self, request, queryset, view):
+        if "search_rank" in queryset.query.annotations:
+            return ("-search_rank", "-id")
+        return super().get_ordering(request, queryset, view)
+
+
+class RecipeAttrCursorPagination(RecipeCursorPagination):
+    ordering = ("-name",)
+
+    def get_ordering(self, request, queryset, view):
+        return queryset.query.order_by or self.ordering
@@ -0,0 +1,25 @@
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Lazily split a newline-delimited JSON body into `(line_number, line)` pairs.
+
+    Decoding each line is left to the caller so that a malformed row can be
+    reported without aborting the rest of the upload.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if stream is None:
+            return iter(())
+
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        return self._iter_lines(stream, encoding)
+
+    def _iter_lines(self, stream, encoding):
+        for line_number, line in enumerate(stream, 1):
+            line = line.decode(encoding, errors="replace").strip()
+            if line:
+                yield line_number, line
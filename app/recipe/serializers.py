@@ -1,22 +1,100 @@
-from core.models import Ingredient, Recipe, Tag
+from collections import Counter
+from itertools import chain
+
+from core.etags import bump_change_version
+from core.models import Ingredient, Recipe, Tag, recipe_image_variant_path
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext as _
 from rest_framework import serializers
 
 
-class TagSerializer(serializers.ModelSerializer):
+class RecipeAttrSerializer(serializers.ModelSerializer):
+    def get_fields(self):
+        fields = super().get_fields()
+        # Usage counts are served by the tag/ingredient endpoints only, not
+        # nested in recipes.
+        if self.root not in (self, self.parent):
+            fields.pop("recipe_count")
+        return fields
+
+    def validate_name(self, value):
+        if self.parent is not None:
+            return value
+
+        queryset = self.Meta.model.objects.filter(
+            user=self.context["request"].user, name=value
+        )
+        if self.instance is not None:
+            queryset = queryset.exclude(id=self.instance.id)
+        if queryset.exists():
+            msg = _("An item with this name already exists.")
+            raise serializers.ValidationError(msg, code="unique")
+
+        return value
+
+
+class TagSerializer(RecipeAttrSerializer):
     class Meta:
         model = Tag
-        fields = ["id", "name"]
-        read_only_fields = ["id"]
+        fields = ["id", "name", "recipe_count"]
+        read_only_fields = ["id", "recipe_count"]
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(RecipeAttrSerializer):
     class Meta:
         model = Ingredient
-        fields = ["id", "name"]
-        read_only_fields = ["id"]
+        fields = ["id", "name", "recipe_count"]
+        read_only_fields = ["id", "recipe_count"]
+
+
+class RecipeListSerializer(serializers.ListSerializer):
+    def _link_attrs(self, recipes, field_name, model, attrs_per_recipe):
+        objs = self.child._get_or_create_attrs(model, chain(*attrs_per_recipe))
+        ids_by_name = {obj.name: obj.id for obj in objs}
+        through = getattr(Recipe, field_name).through
+        target_field = f"{model._meta.model_name}_id"
+        links = through.objects.bulk_create(
+            through(recipe_id=recipe.id, **{target_field: ids_by_name[name]})
+            for recipe, attrs in zip(recipes, attrs_per_recipe)
+            for name in dict.fromkeys(attr["name"] for attr in attrs)
+        )
+        model.objects.add_recipe_counts(
+            Counter(getattr(link, target_field) for link in links)
+        )
+
+    def create(self, validated_data):
+        tags = [attrs.pop("tags", []) for attrs in validated_data]
+        ingredients = [attrs.pop("ingredients", []) for attrs in validated_data]
+        with transaction.atomic():
+            recipes = Recipe.objects.bulk_create(
+                Recipe(**attrs) for attrs in validated_data
+            )
+            self._link_attrs(recipes, "tags", Tag, tags)
+            self._link_attrs(recipes, "ingredients", Ingredient, ingredients)
+            # bulk_create() sends no signals, so bump the owners' versions here.
+            for user_id in {recipe.user_id for recipe in recipes}:
+                bump_change_version(user_id)
+
+        return recipes
+
+
+class SparseFieldsMixin:
+    """Restrict the serialized fields to a `fields` kwarg, if one is given."""
 
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = fields
 
-class RecipeSerializer(serializers.ModelSerializer):
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.sparse_fields is not None:
+            for name in set(fields) - set(self.sparse_fields):
+                del fields[name]
+        return fields
+
+
+class RecipeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     tags = TagSerializer(many=True, required=False)
     ingredients = IngredientSerializer(many=True, required=False)
 
@@ -24,30 +102,39 @@ class RecipeSerializer(serializers.ModelSerializer):
         model = Recipe
         fields = ["id", "title", "time_minutes", "price", "link", "tags", "ingredients"]
         read_only_fields = ["id"]
+        list_serializer_class = RecipeListSerializer
 
-    def _get_or_create_tags(self, tags, recipe):
+    def _get_or_create_attrs(self, model, attrs):
         auth_user = self.context["request"].user
+        names = list(dict.fromkeys(attr["name"] for attr in attrs))
+        if not names:
+            return []
+
+        objs = list(model.objects.filter(user=auth_user, name__in=names))
+        missing = set(names) - {obj.name for obj in objs}
+        if missing:
+            model.objects.bulk_create(
+                [model(user=auth_user, name=name) for name in missing],
+                ignore_conflicts=True,
+            )
+            objs += model.objects.filter(user=auth_user, name__in=missing)
 
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(user=auth_user, **tag)
-            recipe.tags.add(tag_obj)
+        return objs
 
-    def _get_or_create_ingredients(self, ingredients, recipe):
-        auth_user = self.context["request"].user
+    def _get_or_create_tags(self, tags):
+        return self._get_or_create_attrs(Tag, tags)
 
-        for ingredient in ingredients:
-            ingredient_obj, created = Ingredient.objects.get_or_create(
-                user=auth_user,
-                **ingredient,
-            )
-            recipe.ingredients.add(ingredient_obj)
+    def _get_or_create_ingredients(self, ingredients):
+        return self._get_or_create_attrs(Ingredient, ingredients)
 
     def create(self, validated_data):
         tags = validated_data.pop("tags", [])
         ingredients = validated_data.pop("ingredients", [])
         recipe = Recipe.objects.create(**validated_data)
-        self._get_or_create_tags(tags, recipe)
-        self._get_or_create_ingredients(ingredients, recipe)
+        if tags:
+            recipe.tags.add(*self._get_or_create_tags(tags))
+        if ingredients:
+            recipe.ingredients.add(*self._get_or_create_ingredients(ingredients))
 
         return recipe
 
@@ -55,12 +142,10 @@ class RecipeSerializer(serializers.ModelSerializer):
         tags = validated_data.pop("tags", None)
         ingredients = validated_data.pop("ingredients", None)
         if tags is not None:
-            instance.tags.clear()
-            self._get_or_create_tags(tags, instance)
+            instance.tags.set(self._get_or_create_tags(tags))
 
         if ingredients is not None:
-            instance.ingredients.clear()
-            self._get_or_create_ingredients(ingredients, instance)
+            instance.ingredients.set(self._get_or_create_ingredients(ingredients))
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -69,14 +154,42 @@ class RecipeSerializer(serializers.ModelSerializer):
         return instance
 
 
+class ImageVariantsField(serializers.Field):
+    """URLs of the resized copies generated for a recipe image."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("source", "image")
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+
+        request = self.context.get("request")
+        urls = {}
+        for variant in settings.RECIPE_IMAGE_VARIANTS:
+            url = value.storage.url(recipe_image_variant_path(value.name, variant))
+            urls[variant] = request.build_absolute_uri(url) if request else url
+        return urls
+
+
 class RecipeDetailSerializer(RecipeSerializer):
+    image_variants = ImageVariantsField()
+
     class Meta(RecipeSerializer.Meta):
-        fields = RecipeSerializer.Meta.fields + ["description", "image"]
+        fields = RecipeSerializer.Meta.fields + [
+            "description",
+            "image",
+            "image_variants",
+        ]
 
 
 class RecipeImageSerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+
     class Meta:
         model = Recipe
-        fields = ["id", "image"]
+        fields = ["id", "image", "image_variants"]
         read_only_fields = ["id"]
         extra_kwargs = {"image": {"required": "True"}}
@@ -0,0 +1,10 @@
+from core.models import Recipe
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from recipe.images import release_image
+
+
+@receiver(post_delete, sender=Recipe)
+def release_deleted_recipe_image(sender, instance, **kwargs):
+    if instance.image:
+        release_image(instance.image.name)
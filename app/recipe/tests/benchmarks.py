@@ -0,0 +1,81 @@
+"""
+Benchmarks for the recipe API, run with `manage.py run_benchmarks`.
+"""
+from django.urls import reverse
+from recipe.fast_serializers import RecipeValuesSerializer
+from recipe.serializers import RecipeSerializer
+from recipe.views import RecipeViewSet
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from utils.benchmark import BenchmarkSuite
+from utils.factories import recipes_factory, user_factory
+
+RECIPES_URL = reverse("recipe:recipe-list")
+TAGS_URL = reverse("recipe:tag-list")
+INGREDIENTS_URL = reverse("recipe:ingredient-list")
+
+
+class RecipeBenchmarks(BenchmarkSuite):
+    sizes = (100, 1000)
+
+    def set_up(self, size):
+        self.user = user_factory()
+        self.recipes = recipes_factory(self.user, size)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _view(self, action, query_params=""):
+        request = Request(APIRequestFactory().get(RECIPES_URL + query_params))
+        request.user = self.user
+        view = RecipeViewSet(action=action, request=request, format_kwarg=None)
+        view.kwargs = {}
+        return view
+
+    def bench_serialize_models(self):
+        queryset = self._view("retrieve").get_queryset()
+        RecipeSerializer(queryset, many=True).data
+
+    def bench_serialize_values(self):
+        queryset = self._view("list").get_queryset()
+        RecipeValuesSerializer(queryset, many=True).data
+
+    def bench_queryset_list(self):
+        list(self._view("list").get_queryset())
+
+    def bench_queryset_filtered(self):
+        tag_ids = ",".join(str(tag.id) for tag in self.recipes[0].tags.all())
+        list(self._view("list", f"?tags={tag_ids}").get_queryset())
+
+    def bench_queryset_search(self):
+        list(self._view("list", "?search=recipe").get_queryset())
+
+    def bench_request_list(self):
+        self.client.get(RECIPES_URL)
+
+    def bench_request_list_page(self):
+        self.client.get(RECIPES_URL, {"page_size": 50})
+
+    def bench_request_detail(self):
+        self.client.get(reverse("recipe:recipe-detail", args=[self.recipes[0].id]))
+
+
+class RecipeAttrBenchmarks(BenchmarkSuite):
+    sizes = (100, 1000)
+
+    def set_up(self, size):
+        self.user = user_factory()
+        recipes_factory(self.user, size)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def bench_request_tags(self):
+        self.client.get(TAGS_URL)
+
+    def bench_request_tags_assigned_popular(self):
+        self.client.get(TAGS_URL, {"assigned_only": 1, "ordering": "popular"})
+
+    def bench_request_ingredients(self):
+        self.client.get(INGREDIENTS_URL)
+
+    def bench_request_ingredients_page(self):
+        self.client.get(INGREDIENTS_URL, {"page_size": 50})
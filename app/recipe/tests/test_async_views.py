@@ -0,0 +1,84 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from user.authentication import token_cache
+from utils.factories import (
+    ingredient_factory,
+    recipe_factory,
+    tag_factory,
+    user_factory,
+)
+
+ASYNC_RECIPES_URL = reverse("recipe:async-recipe-list")
+ASYNC_TAGS_URL = reverse("recipe:async-tag-list")
+ASYNC_INGREDIENTS_URL = reverse("recipe:async-ingredient-list")
+
+
+def async_detail_url(recipe_id):
+    return reverse("recipe:async-recipe-detail", args=[recipe_id])
+
+
+class AsyncReadEndpointTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = user_factory()
+        self.token = Token.objects.create(user=self.user)
+        self.auth = {"HTTP_AUTHORIZATION": f"Token {self.token.key}"}
+        self.client = APIClient()
+        self.client.credentials(**self.auth)
+
+    def test__async_endpoints__match_sync_responses(self):
+        recipe = recipe_factory(user=self.user)
+        recipe.tags.add(tag_factory(user=self.user, name="Vegan"))
+        recipe.ingredients.add(ingredient_factory(user=self.user, name="Salt"))
+        pairs = [
+            (ASYNC_RECIPES_URL, reverse("recipe:recipe-list")),
+            (
+                async_detail_url(recipe.id),
+                reverse("recipe:recipe-detail", args=[recipe.id]),
+            ),
+            (ASYNC_TAGS_URL, reverse("recipe:tag-list")),
+            (ASYNC_INGREDIENTS_URL, reverse("recipe:ingredient-list")),
+        ]
+
+        for async_url, sync_url in pairs:
+            with self.subTest(url=async_url):
+                res = self.client.get(async_url)
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual(res.json(), self.client.get(sync_url).json())
+
+    def test__async_list__only_returns_own_recipes(self):
+        recipe_factory(user=user_factory(email="other@example.com"))
+        recipe = recipe_factory(user=self.user)
+
+        res = self.client.get(ASYNC_RECIPES_URL)
+
+        self.assertEqual([r["id"] for r in res.json()], [recipe.id])
+
+    def test__missing_or_invalid_token__returns_401(self):
+        for headers in ({}, {"HTTP_AUTHORIZATION": "Token invalid"}):
+            with self.subTest(headers=headers):
+                res = APIClient().get(ASYNC_RECIPES_URL, **headers)
+
+                self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+                self.assertEqual(res["WWW-Authenticate"], "Token")
+                self.assertIn("detail", json.loads(res.content))
+
+    def test__write_method__not_allowed(self):
+        res = self.client.post(ASYNC_RECIPES_URL, {})
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def test__async_client__resolves_cached_token(self):
+        # AsyncClient takes raw ASGI header names.
+        headers = {"authorization": f"Token {self.token.key}"}
+        await self.async_client.get(ASYNC_TAGS_URL, **headers)
+
+        res = await self.async_client.get(ASYNC_TAGS_URL, **headers)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(await token_cache.aget(self.token.key))
@@ -0,0 +1,114 @@
+from core.models import ChangeVersion
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from utils.factories import recipe_factory, tag_factory, user_factory
+
+RECIPES_URL = reverse("recipe:recipe-list")
+TAGS_URL = reverse("recipe:tag-list")
+ME_URL = reverse("user:me")
+
+
+def detail_url(recipe_id):
+    return reverse("recipe:recipe-detail", args=[recipe_id])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = user_factory()
+        self.client.force_authenticate(self.user)
+
+    def test__list_with_matching_etag__returns_304_without_loading_data(self):
+        recipe_factory(user=self.user)
+        etag = self.client.get(RECIPES_URL)["ETag"]
+
+        with self.assertNumQueries(1):
+            res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+
+    def test__list_after_change__returns_new_etag(self):
+        recipe = recipe_factory(user=self.user)
+        etag = self.client.get(RECIPES_URL)["ETag"]
+
+        recipe.tags.add(tag_factory(user=self.user, name="Vegan"))
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data[0]["tags"]), 1)
+
+    def test__etag_differs_per_query_string(self):
+        first = self.client.get(RECIPES_URL)["ETag"]
+        second = self.client.get(RECIPES_URL, {"page_size": 1})["ETag"]
+
+        self.assertNotEqual(first, second)
+
+    def test__other_user_changes__keep_etag(self):
+        etag = self.client.get(TAGS_URL)["ETag"]
+
+        other_user = user_factory(email="other@example.com")
+        tag_factory(user=other_user, name="Vegan")
+        res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test__detail_with_matching_etag__returns_304(self):
+        url = detail_url(recipe_factory(user=self.user).id)
+        etag = self.client.get(url)["ETag"]
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test__detail_after_update__returns_200(self):
+        recipe = recipe_factory(user=self.user)
+        url = detail_url(recipe.id)
+        etag = self.client.get(url)["ETag"]
+
+        self.client.patch(url, {"title": "New title"})
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["title"], "New title")
+
+    def test__me_etag__changes_after_profile_update(self):
+        etag = self.client.get(ME_URL)["ETag"]
+        self.assertEqual(
+            self.client.get(ME_URL, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        self.client.patch(ME_URL, {"name": "New name"})
+        res = self.client.get(ME_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["name"], "New name")
+
+    def test__delete_user_with_recipes__succeeds(self):
+        recipe = recipe_factory(user=self.user)
+        recipe.tags.add(tag_factory(user=self.user, name="Vegan"))
+
+        # TestCase checks the deferred foreign keys when the test ends.
+        self.user.delete()
+
+        self.assertFalse(ChangeVersion.objects.filter(user_id=self.user.id).exists())
+
+    def test__etag__same_on_200_and_304_with_or_without_compression(self):
+        for count in (0, 50):
+            for i in range(count):
+                recipe_factory(user=self.user, title=f"Recipe {i}")
+            with self.subTest(recipes=count):
+                res = self.client.get(RECIPES_URL, HTTP_ACCEPT_ENCODING="gzip")
+                not_modified = self.client.get(
+                    RECIPES_URL,
+                    HTTP_ACCEPT_ENCODING="gzip",
+                    HTTP_IF_NONE_MATCH=res["ETag"],
+                )
+
+                self.assertEqual(res.has_header("Content-Encoding"), count > 0)
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(not_modified["ETag"], res["ETag"])
@@ -78,6 +78,7 @@ class PrivateIngredientAPITests(TestCase):
         ing2 = ingredient_factory(user=self.user, name="Turkey")
         recipe = recipe_factory(user=self.user)
         recipe.ingredients.add(ing1)
+        ing1.refresh_from_db()
 
         res = self.client.get(INGREDIENTS_URL, {"assigned_only": 1})
 
@@ -0,0 +1,122 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from utils.factories import (
+    ingredient_factory,
+    recipe_factory,
+    tag_factory,
+    user_factory,
+)
+
+RECIPES_URL = reverse("recipe:recipe-list")
+TAGS_URL = reverse("recipe:tag-list")
+INGREDIENTS_URL = reverse("recipe:ingredient-list")
+
+# Maximum number of queries each endpoint may issue, independent of row count.
+# Reads include the change-version lookup used for ETags, writes bump it.
+QUERY_BUDGETS = {
+    "recipe-list": 4,
+    "recipe-detail": 4,
+    "recipe-partial-update": 7,
+    "recipe-create": 18,
+    "tag-list": 2,
+    "ingredient-list": 2,
+}
+
+SMALL_DATASET = 2
+LARGE_DATASET = 20
+
+
+def detail_url(recipe_id):
+    return reverse("recipe:recipe-detail", args=[recipe_id])
+
+
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = user_factory()
+        self.client.force_authenticate(self.user)
+
+    def _create_recipes(self, count):
+        recipes = []
+        for i in range(count):
+            recipe = recipe_factory(user=self.user, title=f"Recipe {count}-{i}")
+            recipe.tags.add(
+                tag_factory(user=self.user, name=f"Tag {count}-{i}"),
+                tag_factory(user=self.user, name=f"Other tag {count}-{i}"),
+            )
+            recipe.ingredients.add(
+                ingredient_factory(user=self.user, name=f"Ingredient {count}-{i}"),
+                ingredient_factory(
+                    user=self.user, name=f"Other ingredient {count}-{i}"
+                ),
+            )
+            recipes.append(recipe)
+        return recipes
+
+    def _assert_within_budget(self, endpoint, method, url, params=None):
+        for count in (SMALL_DATASET, LARGE_DATASET):
+            with self.subTest(rows=count):
+                recipes = self._create_recipes(count)
+                target_url = url(recipes[0]) if callable(url) else url
+                data = params(recipes[0]) if callable(params) else params
+                with self.assertNumQueries(QUERY_BUDGETS[endpoint]):
+                    res = getattr(self.client, method)(target_url, data)
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test__list_recipes__within_budget(self):
+        self._assert_within_budget("recipe-list", "get", RECIPES_URL)
+
+    def test__list_recipes_filtered__within_budget(self):
+        def tags_param(recipe):
+            return {"tags": ",".join(str(tag.id) for tag in recipe.tags.all())}
+
+        self._assert_within_budget("recipe-list", "get", RECIPES_URL, tags_param)
+
+    def test__list_recipes_paginated__within_budget(self):
+        self._assert_within_budget("recipe-list", "get", RECIPES_URL, {"page_size": 5})
+
+    def test__get_recipe_detail__within_budget(self):
+        self._assert_within_budget(
+            "recipe-detail", "get", lambda recipe: detail_url(recipe.id)
+        )
+
+    def test__partial_update_recipe__within_budget(self):
+        self._assert_within_budget(
+            "recipe-partial-update",
+            "patch",
+            lambda recipe: detail_url(recipe.id),
+            {"title": "New title"},
+        )
+
+    def test__create_recipe_with_attrs__within_budget(self):
+        for count in (SMALL_DATASET, LARGE_DATASET):
+            with self.subTest(attrs=count):
+                tag_factory(user=self.user, name=f"Existing tag {count}")
+                payload = {
+                    "title": "Recipe",
+                    "time_minutes": 5,
+                    "price": "5.50",
+                    "tags": [{"name": f"Tag {count} {i}"} for i in range(count)]
+                    + [{"name": f"Existing tag {count}"}],
+                    "ingredients": [
+                        {"name": f"Ingredient {count} {i}"} for i in range(count)
+                    ],
+                }
+
+                with self.assertNumQueries(QUERY_BUDGETS["recipe-create"]):
+                    res = self.client.post(RECIPES_URL, payload, format="json")
+
+                self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+                self.assertEqual(len(res.data["tags"]), count + 1)
+                self.assertEqual(len(res.data["ingredients"]), count)
+
+    def test__list_tags__within_budget(self):
+        self._assert_within_budget("tag-list", "get", TAGS_URL)
+
+    def test__list_tags_assigned_only__within_budget(self):
+        self._assert_within_budget("tag-list", "get", TAGS_URL, {"assigned_only": 1})
+
+    def test__list_ingredients__within_budget(self):
+        self._assert_within_budget("ingredient-list", "get", INGREDIENTS_URL)
@@ -1,13 +1,27 @@
+import hashlib
+import io
+import json
 import os.path
 import tempfile
 from decimal import Decimal
-
-from core.models import Ingredient, Recipe, Tag
-from django.test import TestCase
+from unittest.mock import patch
+
+from core.models import ImageBlob, Ingredient, Recipe, Tag, recipe_image_variant_path
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Prefetch
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from PIL import Image
+from recipe.images import generate_variants
 from recipe.serializers import RecipeDetailSerializer, RecipeSerializer
+from recipe.views import RecipeViewSet
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 from utils.factories import (
     EXAMPLE_LINK,
@@ -21,12 +35,17 @@ from utils.factories import (
 )
 
 RECIPES_URL = reverse("recipe:recipe-list")
+IMPORT_URL = reverse("recipe:recipe-import-recipes")
 
 
 def detail_url(recipe_id):
     return reverse("recipe:recipe-detail", args=[recipe_id])
 
 
+def ndjson(*rows):
+    return "\n".join(json.dumps(row) for row in rows)
+
+
 def image_upload_url(recipe_id):
     return reverse("recipe:recipe-upload-image", args=[recipe_id])
 
@@ -58,6 +77,28 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test__list_recipes__renders_same_bytes_as_model_serializer(self):
+        for index, price in enumerate(["5.50", "0.05", "999.99"]):
+            recipe = recipe_factory(
+                user=self.user, title=f"Recipe {index}", price=Decimal(price)
+            )
+            recipe.tags.add(
+                tag_factory(user=self.user, name=f"Tag {index}"),
+                tag_factory(user=self.user, name=f"Shared {index % 2}")
+                if index < 2
+                else Tag.objects.get(name="Shared 0"),
+            )
+            recipe.ingredients.add(ingredient_factory(user=self.user, name=f"I{index}"))
+
+        res = self.client.get(RECIPES_URL, HTTP_ACCEPT="application/json")
+        recipes = Recipe.objects.order_by("-id").prefetch_related(
+            Prefetch("tags", queryset=Tag.objects.order_by("id")),
+            Prefetch("ingredients", queryset=Ingredient.objects.order_by("id")),
+        )
+        expected = JSONRenderer().render(RecipeSerializer(recipes, many=True).data)
+
+        self.assertEqual(res.content, expected)
+
     def test__list_recipes_authenticated__lists_only_recipes_for_authenticated_user(
         self,
     ):
@@ -202,6 +243,21 @@ class PrivateRecipeAPITests(TestCase):
                 recipe.tags.filter(name=tag["name"], user=self.user).exists()
             )
 
+    def test__create_recipe_with_duplicated_tags__creates_tag_once(self):
+        payload = {
+            "title": EXAMPLE_TITLE,
+            "time_minutes": EXAMPLE_TIME_MINUTES,
+            "price": EXAMPLE_PRICE,
+            "tags": [{"name": "Thai"}, {"name": "Thai"}],
+        }
+
+        res = self.client.post(RECIPES_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        recipe = Recipe.objects.get(id=res.data["id"])
+        self.assertEqual(recipe.tags.count(), 1)
+        self.assertEqual(Tag.objects.filter(user=self.user, name="Thai").count(), 1)
+
     def test__create_tag_on_recipe_update(self):
         recipe = recipe_factory(user=self.user)
         tag_name = "Lunch"
@@ -363,6 +419,171 @@ class PrivateRecipeAPITests(TestCase):
         self.assertIn(s2.data, res.data)
         self.assertNotIn(s3.data, res.data)
 
+    def test_filter_recipes_by_multiple_tags_returns_each_recipe_once(self):
+        recipe = recipe_factory(user=self.user)
+        t1 = tag_factory(user=self.user, name="Vegan")
+        t2 = tag_factory(user=self.user, name="Dinner")
+        recipe.tags.add(t1, t2)
+
+        res = self.client.get(RECIPES_URL, {"tags": f"{t1.id},{t2.id}"})
+
+        self.assertEqual([r["id"] for r in res.data], [recipe.id])
+
+    def test_filter_recipes_by_tags_match_all(self):
+        r1 = recipe_factory(user=self.user, title="Curry")
+        r2 = recipe_factory(user=self.user, title="Salad")
+        t1 = tag_factory(user=self.user, name="Vegan")
+        t2 = tag_factory(user=self.user, name="Dinner")
+        r1.tags.add(t1, t2)
+        r2.tags.add(t1)
+
+        params = {"tags": f"{t1.id},{t2.id}", "match": "all"}
+        res = self.client.get(RECIPES_URL, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["id"] for r in res.data], [r1.id])
+
+    def test_filter_recipes_by_tags_and_ingredients_match_all(self):
+        r1 = recipe_factory(user=self.user, title="Curry")
+        r2 = recipe_factory(user=self.user, title="Salad")
+        tag = tag_factory(user=self.user, name="Vegan")
+        i1 = ingredient_factory(user=self.user, name="Rice")
+        i2 = ingredient_factory(user=self.user, name="Tofu")
+        r1.tags.add(tag)
+        r1.ingredients.add(i1, i2)
+        r2.tags.add(tag)
+        r2.ingredients.add(i1)
+
+        params = {
+            "tags": str(tag.id),
+            "ingredients": f"{i1.id},{i2.id},{i2.id}",
+            "match": "all",
+        }
+        res = self.client.get(RECIPES_URL, params)
+
+        self.assertEqual([r["id"] for r in res.data], [r1.id])
+
+    def test_filter_recipes_invalid_match_returns_400(self):
+        res = self.client.get(RECIPES_URL, {"tags": "1", "match": "some"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_recipes_matches_title_and_description(self):
+        r1 = recipe_factory(user=self.user, title="Chicken curry", description="")
+        r2 = recipe_factory(
+            user=self.user, title="Rice bowl", description="Mild curries"
+        )
+        recipe_factory(user=self.user, title="Pancakes", description="Sweet")
+        other_user = user_factory(email="other@example.com")
+        recipe_factory(user=other_user, title="Curry")
+
+        res = self.client.get(RECIPES_URL, {"search": "curry"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["id"] for r in res.data], [r1.id, r2.id])
+
+    def test_search_recipes_paginated_keeps_rank_order(self):
+        in_title = [
+            recipe_factory(user=self.user, title=f"Curry {i}", description="")
+            for i in range(3)
+        ]
+        in_description = [
+            recipe_factory(user=self.user, title=f"Dish {i}", description="curry")
+            for i in range(3)
+        ]
+        expected = [r.id for r in reversed(in_title)] + [
+            r.id for r in reversed(in_description)
+        ]
+
+        res = self.client.get(RECIPES_URL, {"search": "curry", "page_size": 4})
+        ids = [r["id"] for r in res.data["results"]]
+        res = self.client.get(res.data["next"])
+        ids += [r["id"] for r in res.data["results"]]
+
+        self.assertEqual(ids, expected)
+        self.assertIsNone(res.data["next"])
+
+    def test__list_recipes_with_page_size__paginates_by_cursor(self):
+        recipes = [recipe_factory(user=self.user, title=f"R{i}") for i in range(5)]
+        expected_ids = [recipe.id for recipe in reversed(recipes)]
+
+        res = self.client.get(RECIPES_URL, {"page_size": 2})
+        pages = [res.data]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            pages.append(res.data)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([len(page["results"]) for page in pages], [2, 2, 1])
+        ids = [recipe["id"] for page in pages for recipe in page["results"]]
+        self.assertEqual(ids, expected_ids)
+
+    def test__list_recipes_without_page_size__returns_full_list(self):
+        recipe_factory(user=self.user)
+        recipe_factory(user=self.user)
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertIsInstance(res.data, list)
+        self.assertEqual(len(res.data), 2)
+
+    def test__list_recipes_with_fields__trims_output_and_query(self):
+        recipe = recipe_factory(user=self.user)
+        recipe.tags.add(tag_factory(user=self.user, name="Vegan"))
+
+        # ETag version lookup and the recipe query, no tag/ingredient queries.
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(RECIPES_URL, {"fields": "id,title"})
+
+        self.assertEqual(res.json(), [{"id": recipe.id, "title": recipe.title}])
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('"price"', queries[-1]["sql"])
+
+    def test__list_recipes_with_fields_and_page_size__paginates(self):
+        recipes = [recipe_factory(user=self.user, title=f"R{i}") for i in range(3)]
+
+        res = self.client.get(RECIPES_URL, {"fields": "title", "page_size": 2})
+        next_page = self.client.get(res.data["next"])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [{"title": "R2"}, {"title": "R1"}])
+        self.assertEqual(next_page.data["results"], [{"title": recipes[0].title}])
+
+    def test__get_recipe_with_fields__defers_other_columns(self):
+        recipe = recipe_factory(user=self.user)
+        recipe.tags.add(tag_factory(user=self.user, name="Vegan"))
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(detail_url(recipe.id), {"fields": "title,tags"})
+
+        self.assertEqual(set(res.data), {"title", "tags"})
+        self.assertEqual(res.data["tags"][0]["name"], "Vegan")
+        recipe_sql = next(q["sql"] for q in queries if 'FROM "core_recipe"' in q["sql"])
+        self.assertNotIn('"description"', recipe_sql)
+        self.assertFalse(any("core_ingredient" in q["sql"] for q in queries))
+
+    def test__get_recipe_with_unknown_field__returns_400(self):
+        recipe = recipe_factory(user=self.user)
+
+        res = self.client.get(detail_url(recipe.id), {"fields": "title,secret"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", res.data)
+
+
+class ImmediateExecutor:
+    def submit(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+
+def variant_paths(recipe):
+    return {
+        variant: default_storage.path(
+            recipe_image_variant_path(recipe.image.name, variant)
+        )
+        for variant in settings.RECIPE_IMAGE_VARIANTS
+    }
+
 
 class ImageUploadTests(TestCase):
     def setUp(self):
@@ -372,6 +593,10 @@ class ImageUploadTests(TestCase):
         self.recipe = recipe_factory(user=self.user)
 
     def tearDown(self):
+        if self.recipe.image:
+            for path in variant_paths(self.recipe).values():
+                if os.path.exists(path):
+                    os.remove(path)
         self.recipe.image.delete()
 
     def test__upload_valid_image__successful(self):
@@ -389,6 +614,205 @@ class ImageUploadTests(TestCase):
         self.assertIn("image", res.data)
         self.assertTrue(os.path.exists(self.recipe.image.path))
 
+    @patch("recipe.images.get_executor", return_value=ImmediateExecutor())
+    def test__upload_valid_image__generates_variants(self, patched_executor):
+        url = image_upload_url(self.recipe.id)
+
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as image_file:
+            Image.new("RGB", (2000, 1000)).save(image_file, format="JPEG")
+            image_file.seek(0)
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self.client.post(url, {"image": image_file}, format="multipart")
+
+        self.recipe.refresh_from_db()
+        self.assertEqual(
+            set(res.data["image_variants"]), set(variant_paths(self.recipe))
+        )
+        for variant, path in variant_paths(self.recipe).items():
+            max_width, max_height = settings.RECIPE_IMAGE_VARIANTS[variant]
+            with Image.open(path) as variant_image:
+                self.assertLessEqual(variant_image.width, max_width)
+                self.assertLessEqual(variant_image.height, max_height)
+        detail = self.client.get(detail_url(self.recipe.id))
+        self.assertTrue(
+            detail.data["image_variants"]["thumbnail"].endswith(
+                "_thumbnail_150x150.jpg"
+            )
+        )
+
+    def test__upload_same_image_twice__shares_content_addressed_file(self):
+        other_recipe = recipe_factory(user=self.user)
+        content = self._jpeg_bytes((32, 32))
+
+        self._upload_bytes(content)
+        res = self.client.post(
+            image_upload_url(other_recipe.id),
+            {"image": ContentFile(content, name="copy.jpg")},
+            format="multipart",
+        )
+
+        self.recipe.refresh_from_db()
+        other_recipe.refresh_from_db()
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.recipe.image.name, f"uploads/recipe/{digest}.jpg")
+        self.assertEqual(other_recipe.image.name, self.recipe.image.name)
+        self.assertEqual(
+            ImageBlob.objects.get(name=self.recipe.image.name).ref_count, 2
+        )
+
+    def test__replace_image__deletes_unreferenced_file(self):
+        self._upload_bytes(self._jpeg_bytes((16, 16)))
+        self.recipe.refresh_from_db()
+        old_path = self.recipe.image.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._upload_bytes(self._jpeg_bytes((24, 24)))
+
+        self.recipe.refresh_from_db()
+        self.assertNotEqual(self.recipe.image.path, old_path)
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(self.recipe.image.path))
+
+    def test__delete_recipe__keeps_file_while_referenced(self):
+        other_recipe = recipe_factory(user=self.user)
+        content = self._jpeg_bytes((16, 16))
+        self._upload_bytes(content)
+        self.client.post(
+            image_upload_url(other_recipe.id),
+            {"image": ContentFile(content, name="copy.jpg")},
+            format="multipart",
+        )
+        other_recipe.refresh_from_db()
+        path = other_recipe.image.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other_recipe.delete()
+        self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(detail_url(self.recipe.id))
+        self.assertFalse(os.path.exists(path))
+
+    def test__generate_image_variants_command__backfills_variants(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (600, 300)).save(buffer, format="PNG")
+        self.recipe.image.save("backfill.png", ContentFile(buffer.getvalue()))
+
+        call_command("generate_image_variants", workers=2, stdout=io.StringIO())
+
+        for path in variant_paths(self.recipe).values():
+            self.assertTrue(os.path.exists(path))
+
+    def test__generate_image_variants_command__regenerates_shared_image_once(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (600, 300)).save(buffer, format="PNG")
+        with tempfile.TemporaryDirectory() as media_root, override_settings(
+            MEDIA_ROOT=media_root
+        ):
+            self.recipe.image.save("shared.png", ContentFile(buffer.getvalue()))
+            recipe_factory(user=self.user, image=self.recipe.image.name)
+            generate_variants(self.recipe.image.name)
+            paths = variant_paths(self.recipe).values()
+
+            with patch(
+                "core.management.commands.generate_image_variants.generate_variants",
+                wraps=generate_variants,
+            ) as patched_generate:
+                call_command(
+                    "generate_image_variants",
+                    workers=2,
+                    force=True,
+                    stdout=io.StringIO(),
+                )
+
+            patched_generate.assert_called_once()
+            # Replaced in place: no suffixed copies or temporary files.
+            self.assertEqual(
+                set(os.listdir(os.path.dirname(next(iter(paths))))),
+                {os.path.basename(path) for path in paths},
+            )
+            self.recipe.image = None
+
+    def _upload_bytes(self, content, suffix=".jpg"):
+        url = image_upload_url(self.recipe.id)
+        with tempfile.NamedTemporaryFile(suffix=suffix) as image_file:
+            image_file.write(content)
+            image_file.seek(0)
+            return self.client.post(url, {"image": image_file}, format="multipart")
+
+    def _stored_uploads(self):
+        upload_dir = default_storage.path(os.path.join("uploads", "recipe"))
+        if not os.path.isdir(upload_dir):
+            return set()
+        return {
+            name
+            for name in os.listdir(upload_dir)
+            if os.path.isfile(os.path.join(upload_dir, name))
+        }
+
+    def _jpeg_bytes(self, size):
+        buffer = io.BytesIO()
+        Image.effect_noise(size, 100).convert("RGB").save(buffer, format="JPEG")
+        return buffer.getvalue()
+
+    @override_settings(RECIPE_IMAGE_MAX_UPLOAD_SIZE=1000)
+    def test__upload_with_oversize_content_length__returns_413(self):
+        res = self._upload_bytes(b"x" * 50_000)
+
+        self.assertEqual(res.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    @override_settings(RECIPE_IMAGE_MAX_UPLOAD_SIZE=2000)
+    def test__upload_oversize_file__rejected_while_streaming(self):
+        content = self._jpeg_bytes((64, 64))
+        self.assertGreater(len(content), 2000)
+        before = self._stored_uploads()
+
+        res = self._upload_bytes(content)
+
+        self.assertEqual(res.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertEqual(self._stored_uploads(), before)
+        self.recipe.refresh_from_db()
+        self.assertFalse(self.recipe.image)
+
+    @override_settings(RECIPE_IMAGE_MAX_PIXELS=100)
+    def test__upload_image_over_pixel_limit__bad_request(self):
+        before = self._stored_uploads()
+
+        res = self._upload_bytes(self._jpeg_bytes((20, 20)))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("image", res.data)
+        self.assertEqual(self._stored_uploads(), before)
+
+    def test__upload_non_image_file__bad_request(self):
+        before = self._stored_uploads()
+
+        res = self._upload_bytes(b"not an image" * 100, suffix=".txt")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._stored_uploads(), before)
+
+    def test__upload_image_with_invalid_extension__bad_request(self):
+        before = self._stored_uploads()
+
+        res = self._upload_bytes(self._jpeg_bytes((10, 10)), suffix=".exe")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("image", res.data)
+        self.assertEqual(self._stored_uploads(), before)
+
+    def test__upload_unsupported_image_format__bad_request(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (10, 10)).save(buffer, format="BMP")
+        before = self._stored_uploads()
+
+        res = self._upload_bytes(buffer.getvalue(), suffix=".bmp")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("image", res.data)
+        self.assertEqual(self._stored_uploads(), before)
+
     def test__upload_invalid_image__bad_request(self):
         url = image_upload_url(self.recipe.id)
         payload = {"image": "test"}
@@ -396,3 +820,91 @@ class ImageUploadTests(TestCase):
         res = self.client.post(url, payload, format="multipart")
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = user_factory()
+        self.client.force_authenticate(self.user)
+
+    def _import(self, body):
+        return self.client.post(IMPORT_URL, body, content_type="application/x-ndjson")
+
+    def test__import_recipes__creates_recipes_with_tags_and_ingredients(self):
+        tag_factory(user=self.user, name="Dinner")
+        body = ndjson(
+            {
+                "title": "Curry",
+                "time_minutes": 30,
+                "price": "7.50",
+                "tags": [{"name": "Dinner"}, {"name": "Thai"}],
+                "ingredients": [{"name": "Rice"}],
+            },
+            {
+                "title": "Pad thai",
+                "time_minutes": 20,
+                "price": "6.00",
+                "description": "Noodles",
+                "tags": [{"name": "Thai"}],
+            },
+        )
+
+        res = self._import(body)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"created": 2, "errors": []})
+        curry = Recipe.objects.get(user=self.user, title="Curry")
+        self.assertEqual(
+            sorted(curry.tags.values_list("name", flat=True)), ["Dinner", "Thai"]
+        )
+        self.assertEqual(
+            list(curry.ingredients.values_list("name", flat=True)), ["Rice"]
+        )
+        pad_thai = Recipe.objects.get(user=self.user, title="Pad thai")
+        self.assertEqual(pad_thai.description, "Noodles")
+        self.assertEqual(
+            dict(
+                Tag.objects.filter(user=self.user).values_list("name", "recipe_count")
+            ),
+            {"Dinner": 1, "Thai": 2},
+        )
+
+    def test__import_recipes__reports_invalid_rows_and_keeps_valid_ones(self):
+        valid = {"title": "Curry", "time_minutes": 30, "price": "7.50"}
+        body = "\n".join(
+            [json.dumps(valid), "{not json", "", json.dumps({"title": "No time"})]
+        )
+
+        res = self._import(body)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["created"], 1)
+        self.assertEqual([error["line"] for error in res.data["errors"]], [2, 4])
+        self.assertIn("time_minutes", res.data["errors"][1]["errors"])
+        self.assertEqual(Recipe.objects.filter(user=self.user).count(), 1)
+
+    @patch.object(RecipeViewSet, "import_chunk_size", 2)
+    def test__import_recipes__across_chunks__creates_all_rows(self):
+        rows = [
+            {
+                "title": f"Recipe {i}",
+                "time_minutes": i + 1,
+                "price": "1.00",
+                "tags": [{"name": "Shared"}],
+            }
+            for i in range(5)
+        ]
+
+        res = self._import(ndjson(*rows))
+
+        self.assertEqual(res.data, {"created": 5, "errors": []})
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(
+            Recipe.objects.filter(user=self.user, tags__name="Shared").count(), 5
+        )
+
+    def test__import_recipes__unsupported_media_type__returns_415(self):
+        res = self.client.post(IMPORT_URL, [], format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
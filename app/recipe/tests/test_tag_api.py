@@ -40,6 +40,18 @@ class PrivateTagAPITests(TestCase):
         self.assertEqual(res.data, serializer.data)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
+    def test_retrieve_tags_paginated(self):
+        for name in ["Breakfast", "Dessert", "Dinner"]:
+            tag_factory(user=self.user, name=name)
+
+        first = self.client.get(TAGS_URL, {"page_size": 2})
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        names = [tag["name"] for tag in first.data["results"] + second.data["results"]]
+        self.assertEqual(names, ["Dinner", "Dessert", "Breakfast"])
+        self.assertIsNone(second.data["next"])
+
     def test_tags_limited_to_user(self):
         other_user = user_factory(email="other@example.com")
         tag_factory(user=other_user, name="Dessert")
@@ -63,6 +75,18 @@ class PrivateTagAPITests(TestCase):
         tag.refresh_from_db()
         self.assertEqual(tag.name, payload["name"])
 
+    def test_update_tag_to_existing_name_rejected(self):
+        tag_factory(user=self.user, name="Dessert")
+        tag = tag_factory(user=self.user, name="Dinner")
+        payload = {"name": "Dessert"}
+
+        url = detail_url(tag.id)
+        res = self.client.patch(url, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        tag.refresh_from_db()
+        self.assertEqual(tag.name, "Dinner")
+
     def test_delete_tag(self):
         tag = tag_factory(user=self.user, name="Dinner")
 
@@ -78,6 +102,7 @@ class PrivateTagAPITests(TestCase):
         tag2 = tag_factory(user=self.user, name="Lunch")
         recipe = recipe_factory(user=self.user)
         recipe.tags.add(tag1)
+        tag1.refresh_from_db()
 
         res = self.client.get(TAGS_URL, {"assigned_only": 1})
 
@@ -97,3 +122,24 @@ class PrivateTagAPITests(TestCase):
         res = self.client.get(TAGS_URL, {"assigned_only": 1})
 
         self.assertEqual(len(res.data), 1)
+
+    def test_retrieve_tags_ordered_by_popularity(self):
+        rare = tag_factory(user=self.user, name="Rare")
+        common = tag_factory(user=self.user, name="Common")
+        unused = tag_factory(user=self.user, name="Unused")
+        recipe_factory(user=self.user).tags.add(rare, common)
+        recipe_factory(user=self.user).tags.add(common)
+
+        res = self.client.get(TAGS_URL, {"ordering": "popular"})
+        paginated = self.client.get(TAGS_URL, {"ordering": "popular", "page_size": 2})
+
+        self.assertEqual([t["id"] for t in res.data], [common.id, rare.id, unused.id])
+        self.assertEqual([t["recipe_count"] for t in res.data], [2, 1, 0])
+        self.assertEqual(
+            [t["id"] for t in paginated.data["results"]], [common.id, rare.id]
+        )
+
+    def test_retrieve_tags_invalid_ordering_rejected(self):
+        res = self.client.get(TAGS_URL, {"ordering": "id"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,147 @@
+import hashlib
+import io
+import os
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopUpload
+from django.core.validators import validate_image_file_extension
+from django.utils.translation import gettext as _
+from PIL import Image, UnidentifiedImageError
+from rest_framework import exceptions, status
+
+# Accepted decoded formats and the extension stored files get for them.
+IMAGE_EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "GIF": ".gif", "WEBP": ".webp"}
+
+# Largest prefix of an upload kept in memory while looking for the image header.
+MAX_HEADER_SIZE = 2**20
+
+
+class RequestEntityTooLarge(exceptions.APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = _("Uploaded file is too large.")
+    default_code = "too_large"
+
+
+class StreamedImage(UploadedFile):
+    """A validated upload written to a temporary file next to its final place."""
+
+    def __init__(self, name, path, size, content_type, digest, extension, dimensions):
+        super().__init__(file=None, name=name, content_type=content_type, size=size)
+        self.path = path
+        self.digest = digest
+        self.extension = extension
+        self.width, self.height = dimensions
+
+    def temporary_file_path(self):
+        return self.path
+
+
+class StreamingImageUploadHandler(FileUploadHandler):
+    """
+    Write the `image` upload chunk by chunk straight into `MEDIA_ROOT`.
+
+    Only the first `MAX_HEADER_SIZE` bytes are buffered, until Pillow can read
+    the header; the file name extension is checked like `ImageField` does,
+    and the format and the size and pixel limits as soon as they are known.
+    The content hash is computed on the way, so that the file can later be
+    moved to its content-addressed name without being read again. Requires a
+    filesystem-backed default storage.
+    """
+
+    chunk_size = 64 * 2**10
+    field_name = "image"
+
+    def __init__(self, request=None, storage=default_storage):
+        super().__init__(request)
+        self.storage = storage
+        self.max_size = settings.RECIPE_IMAGE_MAX_UPLOAD_SIZE
+        self.max_pixels = settings.RECIPE_IMAGE_MAX_PIXELS
+        self.error = None
+        self.path = None
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        if field_name != self.field_name or self.path is not None:
+            raise SkipFile()
+        try:
+            validate_image_file_extension(File(None, name=self.file_name))
+        except ValidationError as exc:
+            self.error = exceptions.ValidationError({self.field_name: exc.messages})
+            raise StopUpload()
+
+        upload_dir = self.storage.path(os.path.join("uploads", "recipe"))
+        os.makedirs(upload_dir, exist_ok=True)
+        self.path = os.path.join(upload_dir, f".{uuid.uuid4()}.part")
+        self.file = open(self.path, "wb")
+        self.hash = hashlib.sha256()
+        self.header = bytearray()
+        self.size = 0
+        self.dimensions = None
+        self.image_format = None
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self._abort(RequestEntityTooLarge(), connection_reset=True)
+
+        if self.dimensions is None:
+            self.header += raw_data
+            self._read_header(final=len(self.header) >= MAX_HEADER_SIZE)
+
+        self.hash.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.dimensions is None:
+            self._read_header(final=True)
+
+        self.file.close()
+        return StreamedImage(
+            name=self.file_name,
+            path=self.path,
+            size=file_size,
+            content_type=self.content_type,
+            digest=self.hash.hexdigest(),
+            extension=IMAGE_EXTENSIONS[self.image_format],
+            dimensions=self.dimensions,
+        )
+
+    def _read_header(self, final):
+        try:
+            with Image.open(io.BytesIO(self.header)) as image:
+                width, height = image.size
+                self.image_format = image.format
+        except (UnidentifiedImageError, OSError, SyntaxError):
+            if final:
+                msg = _("Upload a valid image.")
+                self._abort(exceptions.ValidationError({self.field_name: [msg]}))
+            return
+        except Image.DecompressionBombError:
+            width, height = self.max_pixels + 1, 1
+        else:
+            if self.image_format not in IMAGE_EXTENSIONS:
+                msg = _("Upload a JPEG, PNG, GIF or WebP image.")
+                self._abort(exceptions.ValidationError({self.field_name: [msg]}))
+
+        if width * height > self.max_pixels:
+            msg = _("Image must not have more than %(max)d pixels.") % {
+                "max": self.max_pixels
+            }
+            self._abort(exceptions.ValidationError({self.field_name: [msg]}))
+        self.dimensions = (width, height)
+        self.header = None
+
+    def _abort(self, error, connection_reset=False):
+        self.error = error
+        self._discard()
+        raise StopUpload(connection_reset=connection_reset)
+
+    def _discard(self):
+        self.file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
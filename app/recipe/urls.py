@@ -1,5 +1,5 @@
 from django.urls import include, path
-from recipe import views
+from recipe import async_views, views
 from rest_framework.routers import DefaultRouter
 
 router = DefaultRouter()
@@ -9,4 +9,18 @@ router.register("ingredients", views.IngredientViewSet)
 
 app_name = "recipe"
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path("async/recipes/", async_views.recipe_list, name="async-recipe-list"),
+    path(
+        "async/recipes/<int:pk>/",
+        async_views.recipe_detail,
+        name="async-recipe-detail",
+    ),
+    path("async/tags/", async_views.tag_list, name="async-tag-list"),
+    path(
+        "async/ingredients/",
+        async_views.ingredient_list,
+        name="async-ingredient-list",
+    ),
+]
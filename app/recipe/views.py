@@ -1,13 +1,46 @@
+import json
+from functools import cached_property
+from itertools import islice
+
+from core.etags import ConditionalGetMixin
 from core.models import Ingredient, Recipe, Tag
+from django.conf import settings
+from django.db.models import Count, Exists, OuterRef, Prefetch
+from django.utils.translation import gettext as _
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from recipe import serializers
+from recipe.fast_serializers import RecipeValuesSerializer
+from recipe.images import attach_image, schedule_variants
+from recipe.pagination import RecipeAttrCursorPagination, RecipeCursorPagination
+from recipe.parsers import NDJSONParser
 from recipe.serializers import IngredientSerializer
+from recipe.uploads import (
+    RequestEntityTooLarge,
+    StreamedImage,
+    StreamingImageUploadHandler,
+)
 from rest_framework import mixins, status, viewsets
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
+from rest_framework.settings import api_settings
+from user.authentication import CachedTokenAuthentication
+
+# Names are unique per user, so they break ties without an extra sort key.
+ATTR_ORDERINGS = {
+    "name": ("-name",),
+    "popular": ("-recipe_count", "-name"),
+}
+
+
+FIELDS_PARAMETER = OpenApiParameter(
+    "fields",
+    OpenApiTypes.STR,
+    description="Comma separated list of fields to return, loading only those",
+)
 
 
 @extend_schema_view(
@@ -23,30 +56,122 @@ from rest_framework.response import Response
                 OpenApiTypes.STR,
                 description="Comma separated_list of ingredient IDs to filter",
             ),
+            OpenApiParameter(
+                "search",
+                OpenApiTypes.STR,
+                description="Full-text search over title and description, "
+                "results ordered by relevance",
+            ),
+            FIELDS_PARAMETER,
+            OpenApiParameter(
+                "match",
+                OpenApiTypes.STR,
+                enum=["any", "all"],
+                description="Return recipes with any (default) or all of the "
+                "requested tags/ingredients",
+            ),
         ]
-    )
+    ),
+    retrieve=extend_schema(parameters=[FIELDS_PARAMETER]),
 )
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = serializers.RecipeDetailSerializer
     queryset = Recipe.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = RecipeCursorPagination
+    # Split into reads and writes by method unless an action sets it.
+    throttle_scope = None
+    import_chunk_size = 500
 
     def get_queryset(self):
         tags = self.request.query_params.get("tags")
         ingredients = self.request.query_params.get("ingredients")
+        match = self.request.query_params.get("match", "any")
+        if match not in ("any", "all"):
+            raise ValidationError({"match": _("Must be one of: any, all.")})
+
         queryset = self.queryset
         if tags:
             tag_ids = self._params_to_ints(tags)
-            queryset = queryset.filter(tags__id__in=tag_ids)
+            queryset = self._filter_by_attrs(queryset, "tags", tag_ids, match)
         if ingredients:
             ingredient_ids = self._params_to_ints(ingredients)
-            queryset = queryset.filter(ingredients__id__in=ingredient_ids)
-        return queryset.filter(user=self.request.user).order_by("-id").distinct()
+            queryset = self._filter_by_attrs(
+                queryset, "ingredients", ingredient_ids, match
+            )
+        queryset = queryset.filter(user=self.request.user)
+        search = self.request.query_params.get("search")
+        if search:
+            queryset = queryset.search(search).order_by("-search_rank", "-id")
+        else:
+            queryset = queryset.order_by("-id")
+        fields = self.requested_fields
+        if self.use_values_list:
+            return RecipeValuesSerializer.values(queryset, fields)
+        if self.action != "upload_image":
+            # Same nested order as RecipeValuesSerializer.
+            prefetches = {
+                "tags": Prefetch("tags", queryset=Tag.objects.order_by("id")),
+                "ingredients": Prefetch(
+                    "ingredients", queryset=Ingredient.objects.order_by("id")
+                ),
+            }
+            if fields is not None:
+                queryset = queryset.only(*self._model_columns(fields))
+                prefetches = {
+                    name: prefetch
+                    for name, prefetch in prefetches.items()
+                    if name in fields
+                }
+            queryset = queryset.prefetch_related(*prefetches.values())
+        return queryset
+
+    @cached_property
+    def requested_fields(self):
+        """Field names from the `fields` query parameter on reads, or None."""
+        fields = self.request.query_params.get("fields")
+        if (
+            not fields
+            or self.action not in ("list", "retrieve")
+            or getattr(self, "swagger_fake_view", False)
+        ):
+            return None
+
+        fields = list(dict.fromkeys(field.strip() for field in fields.split(",")))
+        unknown = set(fields) - set(self.get_serializer_class()().fields)
+        if unknown:
+            msg = _("Unknown fields: %s.") % ", ".join(sorted(unknown))
+            raise ValidationError({"fields": msg})
+        return fields
+
+    def _model_columns(self, fields):
+        serializer_fields = self.get_serializer_class()().fields
+        return {"id"} | {
+            serializer_fields[name].source
+            for name in fields
+            if not isinstance(serializer_fields[name], ListSerializer)
+        }
+
+    @property
+    def use_values_list(self):
+        # Lists are rendered straight from values() rows, except while the
+        # schema generator inspects the view.
+        return self.action == "list" and not getattr(self, "swagger_fake_view", False)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.requested_fields is not None:
+            kwargs.setdefault("fields", self.requested_fields)
+        if self.use_values_list:
+            kwargs.setdefault("context", self.get_serializer_context())
+            return RecipeValuesSerializer(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
 
     def get_serializer_class(self):
         if self.action == "list":
             return serializers.RecipeSerializer
+        elif self.action == "import_recipes":
+            return serializers.RecipeDetailSerializer
         elif self.action == "upload_image":
             return serializers.RecipeImageSerializer
 
@@ -55,16 +180,93 @@ class RecipeViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-    @action(methods=["POST"], detail=True, url_path="upload-image")
+    @action(
+        methods=["POST"],
+        detail=True,
+        url_path="upload-image",
+        throttle_scope="upload",
+    )
     def upload_image(self, request, pk=None):
         recipe = self.get_object()
-        serializer = self.get_serializer(recipe, data=request.data)
+        # Multipart framing adds a little on top of the file itself.
+        max_body_size = settings.RECIPE_IMAGE_MAX_UPLOAD_SIZE + 2**14
+        if int(request.META.get("CONTENT_LENGTH") or 0) > max_body_size:
+            raise RequestEntityTooLarge()
+
+        handler = StreamingImageUploadHandler(request._request)
+        request._request.upload_handlers = [handler]
+        image = request.FILES.get("image")
+        if handler.error is not None:
+            raise handler.error
+        if not isinstance(image, StreamedImage):
+            serializer = self.get_serializer(recipe, data=request.data)
+            serializer.is_valid()
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        attach_image(recipe, image)
+        schedule_variants(recipe.image.name)
+        serializer = self.get_serializer(recipe)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="import",
+        parser_classes=[NDJSONParser],
+    )
+    def import_recipes(self, request):
+        rows = iter(request.data)
+        created = 0
+        errors = []
+        while True:
+            chunk = list(islice(rows, self.import_chunk_size))
+            if not chunk:
+                break
+
+            valid_rows = []
+            for line_number, line in chunk:
+                try:
+                    data = json.loads(line)
+                except ValueError as exc:
+                    errors.append(
+                        {
+                            "line": line_number,
+                            "errors": {api_settings.NON_FIELD_ERRORS_KEY: [str(exc)]},
+                        }
+                    )
+                    continue
+
+                serializer = self.get_serializer(data=data)
+                if serializer.is_valid():
+                    valid_rows.append(
+                        {**serializer.validated_data, "user": request.user}
+                    )
+                else:
+                    errors.append({"line": line_number, "errors": serializer.errors})
+
+            if valid_rows:
+                list_serializer = self.get_serializer(many=True)
+                created += len(list_serializer.create(valid_rows))
 
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(
+            {"created": created, "errors": errors}, status=status.HTTP_200_OK
+        )
 
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    def _filter_by_attrs(self, queryset, field_name, attr_ids, match):
+        field = Recipe._meta.get_field(field_name)
+        through = field.remote_field.through
+        attr_column = field.m2m_reverse_name()
+        links = through.objects.filter(**{f"{attr_column}__in": attr_ids})
+        if match == "all":
+            matching = (
+                links.values("recipe_id")
+                .annotate(matched=Count(attr_column))
+                .filter(matched=len(set(attr_ids)))
+                .values("recipe_id")
+            )
+            return queryset.filter(id__in=matching)
+
+        return queryset.filter(Exists(links.filter(recipe_id=OuterRef("id"))))
 
     def _params_to_ints(self, qs):
         return [int(str_id) for str_id in qs.split(",")]
@@ -78,25 +280,37 @@ class RecipeViewSet(viewsets.ModelViewSet):
                 OpenApiTypes.INT,
                 enum=[0, 1],
                 description="Filter items assigned to recipes.",
-            )
+            ),
+            OpenApiParameter(
+                "ordering",
+                OpenApiTypes.STR,
+                enum=["name", "popular"],
+                description="Order by name (default) or by number of recipes",
+            ),
         ]
     )
 )
 class BaseRecipeAttrViewSet(
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
 ):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = RecipeAttrCursorPagination
 
     def get_queryset(self):
         assigned_only = bool(int(self.request.query_params.get("assigned_only", 0)))
-        queryset = self.queryset
+        ordering = self.request.query_params.get("ordering", "name")
+        if ordering not in ATTR_ORDERINGS:
+            raise ValidationError({"ordering": _("Must be one of: name, popular.")})
+
+        queryset = self.queryset.filter(user=self.request.user)
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
-        return queryset.filter(user=self.request.user).order_by("-name").distinct()
+            queryset = queryset.filter(recipe_count__gt=0)
+        return queryset.order_by(*ATTR_ORDERINGS[ordering])
 
 
 class TagViewSet(BaseRecipeAttrViewSet):
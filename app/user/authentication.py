@@ -0,0 +1,64 @@
+import copy
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from utils.cache import TieredCache
+
+
+class TokenCache(TieredCache):
+    """
+    Two-tier token -> (token, user) cache.
+
+    Invalidation clears both tiers of the current process; other processes'
+    local tiers expire after `TTL` seconds.
+    """
+
+    key_prefix = "token-auth:"
+
+    @classmethod
+    def from_settings(cls):
+        options = settings.TOKEN_AUTH_CACHE
+        return cls.from_options(options, ttl=options["TTL"])
+
+
+token_cache = TokenCache.from_settings()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in `TokenAuthentication` that skips the token/user query on hits."""
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, token)
+            return user, token
+        return self._copy(cached)
+
+    async def aauthenticate(self, request):
+        """Async `authenticate`, leaving the event loop only on cache misses."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed(_("Invalid token header."))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed(_("Invalid token header."))
+
+        cached = await token_cache.aget(key)
+        if cached is None:
+            return await sync_to_async(self.authenticate_credentials)(key)
+        return self._copy(cached)
+
+    @staticmethod
+    def _copy(cached):
+        # Hand each request its own copies so that changes made to
+        # request.user never leak into the cached instance.
+        token = copy.copy(cached)
+        token.user = copy.copy(cached.user)
+        return token.user, token
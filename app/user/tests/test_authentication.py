@@ -0,0 +1,107 @@
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from user.authentication import TokenCache, token_cache
+from utils.factories import user_factory
+
+ME_URL = reverse("user:me")
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = user_factory()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test__repeated_requests__resolve_token_from_cache(self):
+        self.client.get(ME_URL)
+
+        # Only the ETag change-version lookup, no token/user query.
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test__invalid_token__returns_401(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test__token_deleted__invalidates_cache(self):
+        self.client.get(ME_URL)
+
+        self.token.delete()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test__user_deactivated__invalidates_cache(self):
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test__user_updated_through_api__invalidates_cache(self):
+        self.client.get(ME_URL)
+
+        self.client.patch(ME_URL, {"name": "New name"})
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data["name"], "New name")
+
+    def test__request_user_changes__do_not_leak_into_cache(self):
+        self.client.get(ME_URL)
+        cached = token_cache.get(self.token.key)
+        cached_name = cached.user.name
+
+        self.client.patch(ME_URL, {"name": "Changed"}, format="json")
+
+        self.assertEqual(cached.user.name, cached_name)
+
+
+class SharedTokenCacheTests(TestCase):
+    def setUp(self):
+        self.backend = caches["default"]
+        self.backend.clear()
+        self.user = user_factory()
+        self.token = Token.objects.create(user=self.user)
+
+    def test__token_set_in_one_process__is_visible_to_another(self):
+        TokenCache(max_size=10, ttl=60, backend=self.backend).set(
+            self.token.key, self.token
+        )
+
+        other_process = TokenCache(max_size=10, ttl=60, backend=self.backend)
+        cached = other_process.get(self.token.key)
+
+        self.assertEqual(cached.user, self.user)
+
+    def test__delete__removes_from_shared_backend(self):
+        cache = TokenCache(max_size=10, ttl=60, backend=self.backend)
+        cache.set(self.token.key, self.token)
+
+        TokenCache(max_size=10, ttl=60, backend=self.backend).delete(self.token.key)
+        cache.local.clear()
+
+        self.assertIsNone(cache.get(self.token.key))
+
+    def test__clear__keeps_other_shared_cache_entries(self):
+        self.backend.set("unrelated", 1)
+        cache = TokenCache(max_size=10, ttl=60, backend=self.backend)
+        cache.set(self.token.key, self.token)
+
+        cache.clear()
+
+        self.assertEqual(self.backend.get("unrelated"), 1)
+        self.assertEqual(len(cache.local), 0)
@@ -0,0 +1,127 @@
+"""
+Micro-benchmark harness used by `manage.py run_benchmarks`.
+
+Suites live in `<app>/tests/benchmarks.py` next to the correctness tests.
+They subclass `BenchmarkSuite` and define `bench_*` methods, which are timed
+for each dataset size after `set_up(size)` has seeded the data. Every size
+runs in a transaction that is rolled back afterwards.
+"""
+import gc
+import json
+import time
+
+from django.db import connection, transaction
+
+SUITES = []
+
+
+class BenchmarkSuite:
+    sizes = (100,)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        SUITES.append(cls)
+
+    @classmethod
+    def benchmark_names(cls):
+        return sorted(name for name in dir(cls) if name.startswith("bench_"))
+
+    def set_up(self, size):
+        pass
+
+
+def metric_name(suite_class, bench_name, size):
+    return f"{suite_class.__module__}.{suite_class.__name__}.{bench_name}[{size}]"
+
+
+def measure(func, repeat):
+    """
+    Return the fastest of `repeat` calls in milliseconds and the query count.
+
+    Like timeit, this takes the minimum with garbage collection off: slower
+    runs measure interference from the rest of the machine, not the code.
+    """
+    func()  # Warm up caches and compiled serializers.
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    # Unlike connection.queries, this is not capped at 9000 entries.
+    with connection.execute_wrapper(count):
+        func()
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {"best_ms": min(timings), "queries": len(queries)}
+
+
+def run_suites(suites, repeat, sizes=None, select=None):
+    """Yield `(metric name, result)` for every benchmark `select` accepts."""
+    for suite_class in suites:
+        for size in sizes or suite_class.sizes:
+            names = [
+                name
+                for name in suite_class.benchmark_names()
+                if select is None or select(metric_name(suite_class, name, size))
+            ]
+            if not names:
+                continue
+            with transaction.atomic():
+                suite = suite_class()
+                suite.set_up(size)
+                for name in names:
+                    result = measure(getattr(suite, name), repeat)
+                    yield metric_name(suite_class, name, size), result
+                transaction.set_rollback(True)
+
+
+def compare(baseline, result, threshold):
+    """
+    List why `result` regressed from `baseline`, if it did.
+
+    Time may grow by `threshold` (a fraction); query counts may not grow.
+    """
+    problems = []
+    limit = baseline["best_ms"] * (1 + threshold)
+    if result["best_ms"] > limit:
+        problems.append(
+            f"{result['best_ms']:.2f} ms > {limit:.2f} ms "
+            f"({baseline['best_ms']:.2f} ms + {threshold:.0%})"
+        )
+    if result["queries"] > baseline["queries"]:
+        problems.append(f"{result['queries']} queries > {baseline['queries']}")
+    return problems
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump(
+            {
+                name: {
+                    "best_ms": round(result["best_ms"], 3),
+                    "queries": result["queries"],
+                }
+                for name, result in sorted(results.items())
+            },
+            f,
+            indent=2,
+        )
+        f.write("\n")
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe, size-bounded in-process cache with per-entry expiry."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            expires_at, value = self._data.get(key, (None, _MISSING))
+            if value is _MISSING:
+                return default
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TieredCache:
+    """
+    Per-process `LRUCache` in front of an optional shared Django cache.
+
+    Reads fall through to the shared tier, whose keys get `key_prefix`, and
+    fill the local one. Other processes' local tiers only expire after `ttl`.
+    """
+
+    key_prefix = ""
+
+    def __init__(self, max_size: int, ttl: float, backend=None):
+        self.ttl = ttl
+        self.local = LRUCache(max_size=max_size, ttl=ttl)
+        self.backend = backend
+
+    @classmethod
+    def from_options(cls, options, **kwargs):
+        """Build from a settings dict with `MAX_SIZE` and an optional `BACKEND`."""
+        backend = options.get("BACKEND")
+        return cls(
+            max_size=options["MAX_SIZE"],
+            backend=caches[backend] if backend else None,
+            **kwargs,
+        )
+
+    def shared_key(self, key):
+        return self.key_prefix + key
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is None and self.backend is not None:
+            value = self.backend.get(self.shared_key(key))
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    async def aget(self, key):
+        value = self.local.get(key)
+        if value is None and self.backend is not None:
+            value = await self.backend.aget(self.shared_key(key))
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.local.set(key, value)
+        if self.backend is not None:
+            self.backend.set(self.shared_key(key), value, self.ttl)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.local.delete(key)
+        if self.backend is not None and keys:
+            self.backend.delete_many([self.shared_key(key) for key in keys])
+
+    def clear(self):
+        """
+        Forget this process's entries.
+
+        Shared entries expire on their own; clearing the whole cache alias
+        would drop entries other code keeps there too.
+        """
+        self.local.clear()
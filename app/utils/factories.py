@@ -1,3 +1,4 @@
+from collections import Counter
 from decimal import Decimal
 
 from core.models import Ingredient, Recipe, Tag, User
@@ -39,3 +40,38 @@ def tag_factory(user: User, name: str, **kwargs) -> Tag:
 def ingredient_factory(user: User, name: str, **kwargs) -> Tag:
     tag = Ingredient.objects.create(user=user, name=name, **kwargs)
     return tag
+
+
+def recipes_factory(user: User, size: int, attrs_per_recipe: int = 3) -> list:
+    """Bulk-create `size` recipes linked to a few of 50 tags and 200 ingredients."""
+    tags = Tag.objects.bulk_create(Tag(user=user, name=f"Tag {i}") for i in range(50))
+    ingredients = Ingredient.objects.bulk_create(
+        Ingredient(user=user, name=f"Ingredient {i}") for i in range(200)
+    )
+    recipes = Recipe.objects.bulk_create(
+        Recipe(
+            user=user,
+            title=f"Recipe {i}",
+            time_minutes=i % 120,
+            price=Decimal(i % 10000) / 100,
+            link=f"https://example.com/{i}",
+        )
+        for i in range(size)
+    )
+    for field_name, attrs in (("tags", tags), ("ingredients", ingredients)):
+        through = getattr(Recipe, field_name).through
+        target_field = f"{attrs[0]._meta.model_name}_id"
+        links = [
+            through(
+                recipe_id=recipe.id,
+                **{target_field: attrs[(i * 7 + j) % len(attrs)].id},
+            )
+            for i, recipe in enumerate(recipes)
+            for j in range(attrs_per_recipe)
+        ]
+        through.objects.bulk_create(links)
+        # bulk_create skips the m2m signals that maintain recipe_count.
+        type(attrs[0]).objects.add_recipe_counts(
+            Counter(getattr(link, target_field) for link in links)
+        )
+    return recipes
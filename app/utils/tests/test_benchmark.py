@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from utils import benchmark
+
+
+class CompareTests(SimpleTestCase):
+    baseline = {"best_ms": 10.0, "queries": 3}
+
+    def test__within_threshold__passes(self):
+        result = {"best_ms": 12.0, "queries": 3}
+
+        self.assertEqual(benchmark.compare(self.baseline, result, 0.25), [])
+
+    def test__slower_than_threshold__regresses(self):
+        result = {"best_ms": 13.0, "queries": 3}
+
+        self.assertEqual(len(benchmark.compare(self.baseline, result, 0.25)), 1)
+
+    def test__more_queries__regresses(self):
+        result = {"best_ms": 5.0, "queries": 4}
+
+        self.assertEqual(len(benchmark.compare(self.baseline, result, 0.25)), 1)
+
+    def test__baseline__round_trips(self):
+        path = os.path.join(tempfile.mkdtemp(), "baseline.json")
+        self.assertEqual(benchmark.load_baseline(path), {})
+
+        benchmark.save_baseline(path, {"a[1]": {"best_ms": 1.23456, "queries": 2}})
+
+        self.assertEqual(
+            benchmark.load_baseline(path), {"a[1]": {"best_ms": 1.235, "queries": 2}}
+        )
+
+
+class RunSuitesTests(TestCase):
+    def test__suite__runs_each_benchmark_per_size(self):
+        class Suite(benchmark.BenchmarkSuite):
+            sizes = (1, 2)
+
+            def set_up(self, size):
+                self.size = size
+
+            def bench_query(self):
+                with connection.cursor() as cursor:
+                    for _ in range(self.size):
+                        cursor.execute("SELECT 1")
+
+        benchmark.SUITES.remove(Suite)
+
+        results = dict(benchmark.run_suites([Suite], repeat=2))
+
+        name = f"{__name__}.Suite.bench_query"
+        self.assertEqual(set(results), {f"{name}[1]", f"{name}[2]"})
+        self.assertEqual(results[f"{name}[2]"]["queries"], 2)
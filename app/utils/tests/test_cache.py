@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+from utils.cache import LRUCache, TieredCache
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test__set_beyond_max_size__evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+
+    @patch("utils.cache.time.monotonic")
+    def test__get_after_ttl__returns_default(self, patched_monotonic):
+        cache = LRUCache(max_size=2, ttl=10)
+        patched_monotonic.return_value = 100
+        cache.set("a", 1)
+
+        patched_monotonic.return_value = 109
+        self.assertEqual(cache.get("a"), 1)
+        patched_monotonic.return_value = 110
+        self.assertEqual(cache.get("a", "missing"), "missing")
+        self.assertEqual(len(cache), 0)
+
+    def test__delete_and_clear__remove_entries(self):
+        cache = LRUCache(max_size=3, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.delete("a")
+        cache.delete("unknown")
+        self.assertIsNone(cache.get("a"))
+        cache.clear()
+        self.assertIsNone(cache.get("b"))
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.backend = LocMemCache("tiered-cache-tests", {})
+        self.addCleanup(self.backend.clear)
+
+    def test__get_missing_locally__reads_through_shared_tier(self):
+        writer = TieredCache(max_size=10, ttl=60, backend=self.backend)
+        reader = TieredCache(max_size=10, ttl=60, backend=self.backend)
+        writer.set("a", 1)
+
+        self.assertEqual(reader.get("a"), 1)
+        self.assertEqual(len(reader.local), 1)
+
+    def test__delete__removes_both_tiers(self):
+        cache = TieredCache(max_size=10, ttl=60, backend=self.backend)
+        cache.set("a", 1)
+
+        cache.delete("a")
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(self.backend.get(cache.shared_key("a")))
+
+    def test__clear__keeps_shared_entries(self):
+        cache = TieredCache(max_size=10, ttl=60, backend=self.backend)
+        cache.set("a", 1)
+
+        cache.clear()
+        self.assertEqual(len(cache.local), 0)
+        self.assertEqual(cache.get("a"), 1)